@@ -10,11 +10,32 @@ class Settings(BaseSettings):
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
     
     MONGO_URI: str = "mongodb://localhost:27017/"
-    MONGO_DB_NAME: str = os.getenv("MONGO_DB_NAME")
+    MONGO_DB_NAME: str = os.getenv("MONGO_DB_NAME", "counting_stars")
+    # DB가 내려가 있을 때 기동/요청이 기본값(30초)만큼 멈추지 않도록 서버 선택 대기 시간 제한
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000))
 
     UPLOAD_DIR: str = os.getenv("UPLOAD_DIR")
     MAX_UPLOAD_SIZE: int = int(os.getenv("MAX_UPLOAD_SIZE", 10 * 1024 * 1024))  
     ALLOWED_EXTENSIONS: list = ["jpg", "jpeg", "png"]
+    MIN_IMAGE_DIMENSION: int = int(os.getenv("MIN_IMAGE_DIMENSION", 64))
+    MAX_IMAGE_PIXELS: int = int(os.getenv("MAX_IMAGE_PIXELS", 50_000_000))
+
+    # 밤하늘 사전 필터 (축소 이미지의 평균 밝기 < MAX_BRIGHTNESS 이고 밝기 < DARK_LEVEL 인 픽셀 비율 > MIN_DARK_RATIO 이면 통과)
+    # 광해가 심한 밤하늘도 통과하도록 낮 사진/밝은 스크린샷만 거르는 보수적인 기본값이며,
+    # 기준값은 `python -m app.services.star_counter calibrate`로 실제 사진에 맞춰 조정 (끄려면 False)
+    NIGHT_SKY_PREFILTER_ENABLED: bool = os.getenv("NIGHT_SKY_PREFILTER_ENABLED", "True").lower() == "true"
+    NIGHT_SKY_MAX_BRIGHTNESS: float = float(os.getenv("NIGHT_SKY_MAX_BRIGHTNESS", 150))
+    NIGHT_SKY_DARK_LEVEL: int = int(os.getenv("NIGHT_SKY_DARK_LEVEL", 150))
+    NIGHT_SKY_MIN_DARK_RATIO: float = float(os.getenv("NIGHT_SKY_MIN_DARK_RATIO", 0.5))
+
+    # 별 검출 엔진 (contour: 기존 윤곽선 기반, peaks: 배경 제거 후 극대점 검출 - 더 빠름)
+    STAR_DETECTOR_ENGINE: str = os.getenv("STAR_DETECTOR_ENGINE", "contour")
+    PEAK_DETECTOR_MAX_DIMENSION: int = int(os.getenv("PEAK_DETECTOR_MAX_DIMENSION", 1024))
+    PEAK_DETECTOR_SIGMA: float = float(os.getenv("PEAK_DETECTOR_SIGMA", 5.0))
+    PEAK_DETECTOR_MIN_CONTRAST: float = float(os.getenv("PEAK_DETECTOR_MIN_CONTRAST", 6.0))
+
+    # 별 개수 추이 집계 격자 크기 (0.1도 ≈ 11km)
+    ROLLUP_CELL_DEGREES: float = float(os.getenv("ROLLUP_CELL_DEGREES", 0.1))
     
     SECRET_KEY: str = os.getenv("SECRET_KEY")
     
@@ -26,11 +47,30 @@ class Settings(BaseSettings):
     ]
     
     DEFAULT_RADIUS: float = 10.0  
+
+    SPOTS_CACHE_TTL: int = int(os.getenv("SPOTS_CACHE_TTL", 300))
+    SPOTS_CACHE_MAX_ENTRIES: int = int(os.getenv("SPOTS_CACHE_MAX_ENTRIES", 512))
+    SPOTS_CACHE_MAX_AGE: int = int(os.getenv("SPOTS_CACHE_MAX_AGE", 60))
+
+    SPOT_INDEX_ENABLED: bool = os.getenv("SPOT_INDEX_ENABLED", "True").lower() == "true"
+    SPOT_INDEX_REFRESH_SECONDS: int = int(os.getenv("SPOT_INDEX_REFRESH_SECONDS", 600))
+
+    INGEST_BATCH_SIZE: int = int(os.getenv("INGEST_BATCH_SIZE", 1000))
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
+    # CPU 예산 (0이면 자동: cgroup 제한/코어 수 기준으로 계산)
+    CPU_LIMIT: int = int(os.getenv("CPU_LIMIT", 0))
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", 0))
+    ANALYSIS_CONCURRENCY: int = int(os.getenv("ANALYSIS_CONCURRENCY", 0))
+    OPENCV_THREADS: int = int(os.getenv("OPENCV_THREADS", 0))
+
+    # 중복 사진 판정 기준 (해밍 거리는 8 미만이어야 밴드 인덱스로 모두 찾을 수 있음)
+    DUPLICATE_HASH_DISTANCE: int = int(os.getenv("DUPLICATE_HASH_DISTANCE", 6))
+    DUPLICATE_RADIUS_KM: float = float(os.getenv("DUPLICATE_RADIUS_KM", 1.0))
+    DUPLICATE_WINDOW_HOURS: int = int(os.getenv("DUPLICATE_WINDOW_HOURS", 72))
     
     class Config:
         env_file = ".env"
         case_sensitive = True
 
 settings = Settings()
-
-os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
\ No newline at end of file
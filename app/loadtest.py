@@ -0,0 +1,487 @@
+"""
+업로드/조회 API 부하 테스트 도구
+
+임시 MongoDB와 FastAPI 앱을 띄우고, 경로별로 지정한 초당 요청 수로
+혼합 트래픽을 보낸 뒤 경로별 처리량과 p50/p95/p99 지연 시간을 출력합니다.
+
+PATH에 mongod 실행 파일이 있어야 하며(임시 디렉터리에서 띄우고 끝나면 삭제),
+없으면 --mongo-uri로 기존 MongoDB를 지정합니다. 이때 --db를 생략하면 임의의 loadtest_* 데이터베이스를
+만들고 끝나면 삭제하며, --db로 지정한 데이터베이스는 --drop을 줄 때만 삭제합니다.
+
+    python -m app.loadtest --duration 30 --workers 2 --rate upload=2 --rate spots_nearby=50
+    python -m app.loadtest --mongo-uri mongodb://localhost:27017/ --db loadtest --drop
+
+지연 시간은 요청이 예정된 시각부터 측정하므로, 서버가 밀려 요청이 늦게 나간 시간도 포함됩니다.
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import secrets
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+# 한국 영역 (합성 데이터 좌표 범위)
+LAT_RANGE = (33.2, 38.5)
+LON_RANGE = (126.0, 129.5)
+
+DEFAULT_RATES = {
+    "upload": 1.0,
+    "analyze": 1.0,
+    "spots_list": 20.0,
+    "spots_nearby": 20.0,
+    "spot_detail": 20.0,
+    "observations_list": 5.0,
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _random_location() -> Tuple[float, float]:
+    return round(random.uniform(*LAT_RANGE), 5), round(random.uniform(*LON_RANGE), 5)
+
+
+# ---------------------------------------------------------------------------
+# 합성 데이터
+# ---------------------------------------------------------------------------
+
+def synthetic_sky_images(count: int, width: int = 1600, height: int = 1200) -> List[bytes]:
+    """무작위 위치/밝기의 별이 찍힌 밤하늘 JPEG 이미지"""
+    import cv2
+    import numpy as np
+
+    rng = np.random.default_rng()
+    images = []
+    for _ in range(count):
+        img = rng.normal(20, 6, (height, width, 3)).clip(0, 255).astype(np.uint8)
+        for _ in range(int(rng.integers(20, 400))):
+            x, y = int(rng.integers(0, width)), int(rng.integers(0, height))
+            brightness = int(rng.integers(120, 256))
+            cv2.circle(img, (x, y), int(rng.integers(1, 3)), (brightness, brightness, brightness), -1)
+        ok, encoded = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 90])
+        if ok:
+            images.append(encoded.tobytes())
+    return images
+
+
+def synthetic_spot_lines(count: int):
+    """ingest_stream에 넘길 관측 명소 NDJSON 줄"""
+    for i in range(count):
+        lat, lon = _random_location()
+        yield json.dumps({
+            "name": f"부하테스트 명소 {i}",
+            "latitude": lat,
+            "longitude": lon,
+            "bortle_scale": random.randint(1, 9),
+            "sqm": round(random.uniform(16, 22), 2),
+            "brightness": round(random.uniform(0, 5), 2),
+            "artificial_brightness": round(random.uniform(0, 5), 2),
+            "ratio": round(random.uniform(0, 10), 2),
+            "elevation": random.randint(0, 1500),
+        }, ensure_ascii=False) + "\n"
+
+
+def multipart_body(fields: Dict[str, str], file_field: str, filename: str, content: bytes) -> Tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; filename="{filename}"\r\n'
+        f'Content-Type: image/jpeg\r\n\r\n'.encode() + content + b"\r\n"
+    )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+# ---------------------------------------------------------------------------
+# MongoDB 대역 / 앱 서버
+# ---------------------------------------------------------------------------
+
+class MongoStandIn:
+    """
+    부하 테스트용 임시 MongoDB
+
+    PATH의 mongod를 임시 디렉터리에서 별도 프로세스로 띄웁니다 (mongo_uri를 지정하면 그대로 사용).
+    """
+    def __init__(self, mongo_uri: Optional[str] = None):
+        self.uri = mongo_uri
+        self._process = None
+        self._dbpath = None
+
+    def start(self):
+        if self.uri:
+            return
+        mongod = shutil.which("mongod")
+        if not mongod:
+            raise SystemExit("PATH에 mongod 실행 파일이 필요합니다 (또는 --mongo-uri로 기존 MongoDB 지정)")
+
+        port = _free_port()
+        self._dbpath = tempfile.mkdtemp(prefix="loadtest-mongo-")
+        self._process = subprocess.Popen(
+            [mongod, "--dbpath", self._dbpath, "--port", str(port), "--bind_ip", "127.0.0.1", "--quiet"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self.uri = f"mongodb://127.0.0.1:{port}/"
+        self._wait_for_port(port)
+
+    def _wait_for_port(self, port: int, timeout: float = 30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise SystemExit("임시 mongod가 시작되지 않았습니다")
+
+    def stop(self):
+        if self._process:
+            self._process.terminate()
+            self._process.wait(timeout=30)
+        if self._dbpath:
+            shutil.rmtree(self._dbpath, ignore_errors=True)
+
+
+class AppServer:
+    """uvicorn 워커 프로세스로 앱 실행"""
+    def __init__(self, port: int, workers: int):
+        self.port = port
+        self.workers = workers
+        self._process = None
+
+    def start(self):
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+             "--port", str(self.port), "--workers", str(self.workers), "--log-level", "warning"],
+            env=os.environ.copy(),
+        )
+        self._wait_until_ready()
+
+    def _wait_until_ready(self, timeout: float = 60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", self.port), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise SystemExit("앱 서버가 시작되지 않았습니다")
+
+    def stop(self):
+        if self._process:
+            self._process.terminate()
+            self._process.wait(timeout=30)
+
+
+# ---------------------------------------------------------------------------
+# asyncio HTTP/1.1 클라이언트 (keep-alive)
+# ---------------------------------------------------------------------------
+
+class HttpConnection:
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._reader = None
+        self._writer = None
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+    def close(self):
+        if self._writer:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def request(self, method: str, path: str, body: bytes = b"",
+                      headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        if self._writer is None:
+            await self._connect()
+
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", f"Content-Length: {len(body)}"]
+        lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        self._writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+        await self._writer.drain()
+
+        try:
+            return await self._read_response()
+        except Exception:
+            self.close()
+            raise
+
+    async def _read_response(self) -> Tuple[int, bytes]:
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise ConnectionError("서버가 연결을 닫았습니다")
+        status = int(status_line.split()[1])
+
+        response_headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if status in (204, 304) or 100 <= status < 200:
+            body = b""
+        elif response_headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self._reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self._reader.readline()
+                    break
+                chunks.append(await self._reader.readexactly(size))
+                await self._reader.readline()
+            body = b"".join(chunks)
+        elif "content-length" in response_headers:
+            body = await self._reader.readexactly(int(response_headers["content-length"]))
+        else:
+            body = await self._reader.read()
+            self.close()
+
+        if response_headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, body
+
+
+# ---------------------------------------------------------------------------
+# 시나리오 / 부하 생성
+# ---------------------------------------------------------------------------
+
+@dataclass
+class RouteStats:
+    sent: int = 0
+    ok: int = 0
+    errors: int = 0
+    dropped: int = 0
+    latencies: List[float] = field(default_factory=list)
+    status_codes: Dict[int, int] = field(default_factory=dict)
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))]
+
+
+def build_scenarios(images: List[bytes], spot_ids: List[str]) -> Dict[str, Callable[[], tuple]]:
+    """경로 이름별 (method, path, body, headers) 생성 함수"""
+    def upload():
+        lat, lon = _random_location()
+        body, content_type = multipart_body(
+            {"latitude": str(lat), "longitude": str(lon), "title": "부하 테스트", "content": "부하 테스트",
+             "manual_star_count_range": random.choice(["0", "1~4", "5~8", "9+"])},
+            "image", "sky.jpg", random.choice(images),
+        )
+        return "POST", "/api/upload", body, {"Content-Type": content_type}
+
+    def analyze():
+        body, content_type = multipart_body({}, "image", "sky.jpg", random.choice(images))
+        return "POST", "/api/analyze-image", body, {"Content-Type": content_type}
+
+    def spots_list():
+        return "GET", f"/api/observation-spots?limit=20&min_score={random.choice([0, 20, 40, 60, 80])}", b"", {}
+
+    def spots_nearby():
+        lat, lon = _random_location()
+        return "GET", f"/api/observation-spots/nearby?lat={lat}&lon={lon}&radius=100", b"", {}
+
+    def spot_detail():
+        spot_id = random.choice(spot_ids) if spot_ids else "000000000000000000000000"
+        return "GET", f"/api/observation-spots/{spot_id}", b"", {}
+
+    def observations_list():
+        return "GET", f"/api/observations?limit=50&skip={random.randint(0, 100)}", b"", {}
+
+    return {
+        "upload": upload,
+        "analyze": analyze,
+        "spots_list": spots_list,
+        "spots_nearby": spots_nearby,
+        "spot_detail": spot_detail,
+        "observations_list": observations_list,
+    }
+
+
+async def run_load(port: int, scenarios: Dict[str, Callable[[], tuple]], rates: Dict[str, float],
+                   duration: float, concurrency: int) -> Dict[str, RouteStats]:
+    """
+    경로별 rate(초당 요청 수)로 포아송 도착 간격에 맞춰 요청을 보냄
+
+    동시에 처리 중인 요청이 concurrency를 넘으면 새 요청은 보내지 않고 dropped로 집계합니다.
+    """
+    pool: asyncio.Queue = asyncio.Queue()
+    for _ in range(concurrency):
+        pool.put_nowait(HttpConnection("127.0.0.1", port))
+
+    stats = {name: RouteStats() for name in rates}
+    in_flight = 0
+    tasks = set()
+
+    async def send(name: str, scheduled: float):
+        nonlocal in_flight
+        method, path, body, headers = scenarios[name]()
+        conn = await pool.get()
+        route = stats[name]
+        try:
+            status, _ = await conn.request(method, path, body, headers)
+            route.status_codes[status] = route.status_codes.get(status, 0) + 1
+            if 200 <= status < 400:
+                route.ok += 1
+                route.latencies.append(time.perf_counter() - scheduled)
+            else:
+                route.errors += 1
+        except Exception:
+            route.errors += 1
+        finally:
+            pool.put_nowait(conn)
+            in_flight -= 1
+
+    async def producer(name: str, rate: float):
+        nonlocal in_flight
+        end = time.perf_counter() + duration
+        next_at = time.perf_counter()
+        while True:
+            next_at += random.expovariate(rate)
+            if next_at >= end:
+                break
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+            if in_flight >= concurrency:
+                stats[name].dropped += 1
+                continue
+            in_flight += 1
+            stats[name].sent += 1
+            task = asyncio.create_task(send(name, next_at))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+    await asyncio.gather(*(producer(name, rate) for name, rate in rates.items() if rate > 0))
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+    while not pool.empty():
+        pool.get_nowait().close()
+    return stats
+
+
+def summarize(stats: Dict[str, RouteStats], duration: float) -> List[dict]:
+    rows = []
+    for name, route in stats.items():
+        rows.append({
+            "route": name,
+            "sent": route.sent,
+            "ok": route.ok,
+            "errors": route.errors,
+            "dropped": route.dropped,
+            "throughput": round(route.ok / duration, 2),
+            "p50_ms": None if not route.latencies else round(_percentile(route.latencies, 50) * 1000, 1),
+            "p95_ms": None if not route.latencies else round(_percentile(route.latencies, 95) * 1000, 1),
+            "p99_ms": None if not route.latencies else round(_percentile(route.latencies, 99) * 1000, 1),
+            "status_codes": route.status_codes,
+        })
+    return rows
+
+
+def _parse_rate(value: str) -> Tuple[str, float]:
+    name, _, rate = value.partition("=")
+    if name not in DEFAULT_RATES or not rate:
+        raise argparse.ArgumentTypeError(f"형식: 경로=초당요청수 (경로: {', '.join(DEFAULT_RATES)})")
+    return name, float(rate)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="업로드/조회 API 부하 테스트")
+    parser.add_argument("--duration", type=float, default=30, help="측정 시간(초)")
+    parser.add_argument("--rate", type=_parse_rate, action="append", default=[],
+                        help="경로별 초당 요청 수 (예: upload=2). 지정하지 않은 경로는 기본값 사용")
+    parser.add_argument("--concurrency", type=int, default=64, help="최대 동시 요청 수 (연결 수)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 워커 수")
+    parser.add_argument("--spots", type=int, default=500, help="미리 적재할 관측 명소 수")
+    parser.add_argument("--images", type=int, default=8, help="합성 이미지 종류 수")
+    parser.add_argument("--mongo-uri", default=None, help="기존 MongoDB 사용 (생략 시 임시 MongoDB 실행)")
+    parser.add_argument("--db", default=None, help="사용할 데이터베이스 이름 (생략 시 임의의 loadtest_* 이름으로 만들고 끝나면 삭제)")
+    parser.add_argument("--drop", action="store_true", help="--mongo-uri 사용 시 --db로 지정한 데이터베이스도 끝나면 삭제")
+    parser.add_argument("--json", dest="json_path", default=None, help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    rates = dict(DEFAULT_RATES)
+    rates.update(dict(args.rate))
+
+    # 직접 지정한 기존 데이터베이스는 --drop 없이는 삭제하지 않음
+    drop_db = args.drop or args.db is None
+    args.db = args.db or f"loadtest_{secrets.token_hex(4)}"
+
+    upload_dir = tempfile.mkdtemp(prefix="loadtest-upload-")
+    mongo = MongoStandIn(args.mongo_uri)
+    server = None
+    try:
+        mongo.start()
+        # 설정은 app 모듈 import 시점에 환경 변수에서 읽으므로 먼저 지정
+        os.environ.update({
+            "MONGO_URI": mongo.uri,
+            "MONGO_DB_NAME": args.db,
+            "UPLOAD_DIR": upload_dir,
+            "WEB_CONCURRENCY": str(args.workers),
+            # 관리자 API는 호출하지 않지만 앱 설정에 필수인 값
+            "SECRET_KEY": os.environ.get("SECRET_KEY", "loadtest-placeholder"),
+        })
+
+        from app.services.database import get_db
+        from app.services.ingest import ingest_stream
+
+        report = ingest_stream(synthetic_spot_lines(args.spots), "spots", "ndjson", get_db(), batch_size=500)
+        spot_ids = [str(doc["_id"]) for doc in get_db()["observation_spots"].find({}, {"_id": 1}).limit(200)]
+        print(f"관측 명소 {report['written']}개 적재 ({report['rows_per_second']}행/초)")
+
+        images = synthetic_sky_images(args.images)
+        print(f"합성 이미지 {len(images)}장 생성 (평균 {sum(map(len, images)) // max(1, len(images)) // 1024}KB)")
+
+        port = _free_port()
+        server = AppServer(port, args.workers)
+        server.start()
+
+        print(f"{args.duration:.0f}초 동안 부하 발생: {rates}")
+        stats = asyncio.run(run_load(port, build_scenarios(images, spot_ids), rates, args.duration, args.concurrency))
+        rows = summarize(stats, args.duration)
+
+        print(f"\n{'route':<18} {'sent':>6} {'ok':>6} {'err':>5} {'drop':>5} {'req/s':>8} "
+              f"{'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9}")
+        for r in rows:
+            print(f"{r['route']:<18} {r['sent']:>6} {r['ok']:>6} {r['errors']:>5} {r['dropped']:>5} "
+                  f"{r['throughput']:>8} {r['p50_ms']!s:>9} {r['p95_ms']!s:>9} {r['p99_ms']!s:>9}")
+
+        if args.json_path:
+            with open(args.json_path, "w") as f:
+                json.dump({"rates": rates, "duration": args.duration, "workers": args.workers, "routes": rows},
+                          f, ensure_ascii=False, indent=2)
+    finally:
+        if server:
+            server.stop()
+        if not args.mongo_uri:
+            mongo.stop()
+        elif drop_db:
+            from app.services.database import get_client
+            get_client().drop_database(args.db)
+        shutil.rmtree(upload_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
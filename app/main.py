@@ -1,11 +1,62 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.datastructures import Headers
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse
 from app.config import settings
 from app.routers import observations
-from app.routers.observation_spots import router as spots_router
+from app.routers.admin import router as admin_router
+from app.routers.observation_spots import router as spots_router, ensure_spot_indexes, get_spot_index, get_spots_collection
+from app.services.database import close_db, get_db, on_connect
+from app.services.spot_search import backfill_search_fields
+from app.services.star_detectors import resolve_engine_name
 from pymongo import MongoClient
+import os
+
+@on_connect
+def initialize_db(db):
+    """DB에 처음 연결됐을 때 인덱스 생성, 검색 필드 보충, 명소 인덱스 로드"""
+    ensure_spot_indexes(db)
+    observations.ensure_observation_indexes(db)
+
+    try:
+        backfill_search_fields(get_spots_collection(db))
+    except Exception as e:
+        print(f"관측 명소 검색 필드 갱신 실패: {e}")
+
+    if settings.SPOT_INDEX_ENABLED:
+        try:
+            get_spot_index().load(get_spots_collection(db))
+        except Exception as e:
+            # 로드 실패 시 첫 조회에서 다시 시도
+            print(f"관측 명소 인덱스 로드 실패: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    앱 시작/종료 시 초기화 작업
+
+    모듈 import 시점에는 DB 연결, 파일 시스템 변경을 하지 않고 여기서 한 번만 수행합니다.
+    OpenCV(StarCounter)는 첫 분석 요청에서 로드합니다.
+    """
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+
+    # 잘못된 STAR_DETECTOR_ENGINE은 첫 분석 요청의 400이 아니라 기동 실패로 드러나도록 이름만 확인
+    resolve_engine_name()
+
+    # 연결과 초기화(initialize_db)는 이벤트 루프를 막지 않도록 스레드풀에서 실행
+    try:
+        await run_in_threadpool(get_db)
+    except Exception as e:
+        # DB가 늦게 뜨는 경우에도 앱은 기동하고, 첫 요청에서 다시 연결/초기화 시도
+        print(f"MongoDB 연결 실패: {e}")
+
+    yield
+
+    close_db()
+
 app = FastAPI(
     title=settings.APP_NAME,
     description="빛공해 데이터 기반 별 관측 장소 추천 및 밤하늘 사진 분석 API",
@@ -13,6 +64,7 @@ app = FastAPI(
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -23,6 +75,49 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+UPLOAD_PATHS = {f"{settings.API_V1_STR}/upload", f"{settings.API_V1_STR}/analyze-image"}
+MULTIPART_OVERHEAD = 64 * 1024
+
+class UploadSizeLimitMiddleware:
+    """
+    이미지 업로드 요청 본문 크기 제한
+
+    Content-Length가 한도를 넘으면 multipart 파싱 전에 바로 거부하고,
+    Content-Length가 없거나(chunked 전송) 실제 본문이 더 길면 받은 바이트를 세어 한도를 넘는 즉시 413으로 거부합니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in UPLOAD_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        limit = settings.MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD
+        detail = f"파일 크기가 너무 큽니다. 최대 {settings.MAX_UPLOAD_SIZE // (1024 * 1024)}MB까지 업로드 가능합니다."
+
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > limit:
+            await JSONResponse(status_code=413, content={"message": detail})(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # multipart 파싱 중에 발생하므로 HTTPException 핸들러가 413 응답으로 변환
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+app.add_middleware(UploadSizeLimitMiddleware)
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     return JSONResponse(
@@ -39,13 +134,15 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 
 app.include_router(observations.router)
 app.include_router(spots_router)
+app.include_router(admin_router)
 #app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
-app.mount("/upload", StaticFiles(directory=str(settings.UPLOAD_DIR)), name="upload")
+# 업로드 디렉터리는 lifespan에서 생성되므로 import 시점의 존재 확인은 생략
+app.mount("/upload", StaticFiles(directory=str(settings.UPLOAD_DIR), check_dir=False), name="upload")
 
 @app.get("/")
 async def root():
     try:
-        client = MongoClient("mongodb://localhost:27017/", serverSelectionTimeoutMS=5000)
+        client = MongoClient(settings.MONGO_URI, serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS)
         client.admin.command('ping')
         print("MongoDB 연결 성공!")
     except Exception as e:
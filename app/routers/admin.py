@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Path, Query, UploadFile
+from pymongo.database import Database
+from typing import Optional
+from app.config import settings
+from app.routers.observation_spots import get_spot_index
+from app.services.database import get_database
+from app.services.response_cache import spots_cache
+import codecs
+import hmac
+
+router = APIRouter(
+    prefix="/api/admin",
+    tags=["관리자 API"],
+    responses={403: {"description": "권한 없음"}},
+)
+
+def verify_admin_key(x_admin_key: Optional[str] = Header(None, description="관리자 키 (SECRET_KEY)")):
+    if not settings.SECRET_KEY:
+        raise HTTPException(status_code=503, detail="관리자 키가 설정되지 않았습니다")
+    if not x_admin_key or not hmac.compare_digest(x_admin_key, settings.SECRET_KEY):
+        raise HTTPException(status_code=403, detail="관리자 권한이 없습니다")
+
+# 적재 작업은 오래 걸리는 동기 I/O이므로 이벤트 루프를 막지 않도록 def로 선언 (스레드풀에서 실행)
+@router.post("/ingest/{kind}", summary="관측 명소/관측 데이터 일괄 적재", dependencies=[Depends(verify_admin_key)])
+def ingest_file(
+    kind: str = Path(..., description="적재할 데이터 종류 (spots, observations)"),
+    file: UploadFile = File(..., description="CSV 또는 NDJSON 파일"),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="입력 형식 (생략 시 확장자로 판단)"),
+    batch_size: int = Query(settings.INGEST_BATCH_SIZE, ge=1, le=10000, description="bulk_write 배치 크기"),
+    db: Database = Depends(get_database),
+):
+    """
+    CSV/NDJSON 파일을 스트리밍으로 읽어 검증 후 일괄 저장합니다.
+
+    처리 행 수, 저장 수, 거부된 행과 사유, 초당 처리 행 수를 반환합니다.
+    """
+    # 적재 모듈(NumPy)은 앱 기동 시점이 아니라 적재 요청이 왔을 때 로드
+    from app.services.ingest import KINDS, ingest_stream
+
+    if kind not in KINDS:
+        raise HTTPException(status_code=404, detail=f"지원하지 않는 데이터 종류입니다: {kind}")
+
+    fmt = format or ("csv" if (file.filename or "").lower().endswith(".csv") else "ndjson")
+    # 업로드 파일을 줄 단위로 디코딩하며 읽어 전체 내용을 메모리에 올리지 않음
+    lines = codecs.iterdecode(file.file, "utf-8-sig")
+    try:
+        report = ingest_stream(lines, kind, fmt, db, batch_size)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"일괄 적재 중 오류 발생: {str(e)}")
+
+    if kind == "spots" and report["written"]:
+        spots_cache.invalidate()
+        get_spot_index().invalidate()
+
+    return {"kind": kind, "format": fmt, **report}
+
+@router.get("/star-counter/stats", summary="별 분석 사전 필터 통계", dependencies=[Depends(verify_admin_key)])
+def star_counter_stats():
+    """
+    현재 워커 프로세스의 밤하늘 사전 필터 통계
+
+    사전 필터로 생략된 분석 수와 이를 통해 절약된 것으로 추정되는 처리 시간을 반환합니다.
+    """
+    from app.services.star_counter import get_star_counter
+    return get_star_counter().prefilter_stats()
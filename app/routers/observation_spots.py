@@ -1,19 +1,55 @@
-from fastapi import APIRouter, HTTPException, Query, Path
+from fastapi import APIRouter, HTTPException, Query, Path, Request
 from typing import Optional
 from datetime import datetime
-from pymongo import MongoClient, GEOSPHERE
+from pymongo import GEOSPHERE
+from pymongo.collection import Collection
+from pymongo.database import Database
 from bson import ObjectId
+from app.config import settings
+from app.services.database import get_db
+from app.services.response_cache import spots_cache, make_cache_key, cached_json_response
+from app.services.spot_search import (
+    SEARCH_FIELDS_PROJECTION,
+    build_autocomplete_query,
+    build_search_query,
+    ensure_search_indexes,
+    normalize_name,
+)
 import math
 
-client = MongoClient("mongodb://localhost:27017/")
-db = client["counting_stars"]
-spots_collection = db["observation_spots"]
+def get_spots_collection(db: Database = None) -> Collection:
+    return (db if db is not None else get_db())["observation_spots"]
+
+def get_spot_index():
+    """NumPy 기반 명소 인덱스는 import 시점이 아니라 처음 필요할 때 로드"""
+    from app.services.spot_index import spot_index
+    return spot_index
+
+def ensure_spot_indexes(db: Database):
+    """앱 시작 시 호출되는 관측 명소 컬렉션 인덱스 설정"""
+    spots_collection = get_spots_collection(db)
+
+    # mongodb 지리적 인덱싱 설정 
+    try:
+        spots_collection.create_index([("location", GEOSPHERE)])
+    except Exception:
+        pass
+
+    # 일괄 등록은 이름 기준으로 upsert하므로 이름은 고유해야 함
+    # (기존 데이터에 같은 이름이 있으면 고유 인덱스를 만들 수 없으므로 일반 인덱스로 대체)
+    try:
+        spots_collection.create_index("name", unique=True)
+    except Exception:
+        try:
+            spots_collection.create_index("name")
+        except Exception:
+            pass
 
-# mongodb 지리적 인덱싱 설정 
-try:
-    spots_collection.create_index([("location", GEOSPHERE)])
-except Exception:
-    pass
+    # 이름 검색/자동완성용 n-gram, 접두어 인덱스
+    try:
+        ensure_search_indexes(spots_collection)
+    except Exception:
+        pass
 
 router = APIRouter(
     prefix="/api",
@@ -21,8 +57,57 @@ router = APIRouter(
     responses={404: {"description": "찾을 수 없음"}},
 )
 
+def _find_observation_spots(skip, limit, min_score, max_score, category, bortle_scale, min_elevation, search):
+    query = {}      # 검색 필터 구성
+    
+    if min_score is not None or max_score is not None:
+        query["sky_quality.score"] = {}
+        if min_score is not None:
+            query["sky_quality.score"]["$gte"] = min_score
+        if max_score is not None:
+            query["sky_quality.score"]["$lte"] = max_score
+    
+    if category:
+        query["sky_quality.category"] = category
+    
+    if bortle_scale is not None:
+        query["sky_quality.bortle_scale"] = {"$lte": bortle_scale}
+    
+    if min_elevation is not None:
+        query["sky_quality.elevation"] = {"$gte": min_elevation}
+    
+    if search:
+        query.update(build_search_query(search))
+    
+    cursor = get_spots_collection().find(query, SEARCH_FIELDS_PROJECTION).sort("sky_quality.score", -1).skip(skip).limit(limit)
+    
+    spots = []
+    for doc in cursor:
+        doc["_id"] = str(doc["_id"])
+        if "created_at" in doc and isinstance(doc["created_at"], datetime):
+            doc["created_at"] = doc["created_at"].isoformat()
+        spots.append(doc)
+    
+    total_count = get_spots_collection().count_documents(query)
+    
+    return {
+        "spots": spots,
+        "total": total_count,
+        "skip": skip,
+        "limit": limit,
+        "filters_applied": {
+            "min_score": min_score,
+            "max_score": max_score,
+            "category": category,
+            "bortle_scale": bortle_scale,
+            "min_elevation": min_elevation,
+            "search": search
+        }
+    }
+
 @router.get("/observation-spots", summary="관측 명소 목록")
 async def get_observation_spots(
+    request: Request,
     skip: int = Query(0, ge=0, description="건너뛸 결과 수"),
     limit: int = Query(50, ge=1, le=100, description="반환할 최대 결과 수"),
     min_score: Optional[float] = Query(None, ge=0, le=100, description="최소 별 관측 품질 점수"),
@@ -37,53 +122,24 @@ async def get_observation_spots(
     
     다양한 필터 옵션으로 별 관측에 적합한 장소 목록을 조회합니다.
     """
+    params = {
+        "skip": skip,
+        "limit": limit,
+        "min_score": min_score,
+        "max_score": max_score,
+        "category": category,
+        "bortle_scale": bortle_scale,
+        "min_elevation": min_elevation,
+        "search": search,
+    }
     try:
-        query = {}      # 검색 필터 구성
-    
-        if min_score is not None or max_score is not None:
-            query["sky_quality.score"] = {}
-            if min_score is not None:
-                query["sky_quality.score"]["$gte"] = min_score
-            if max_score is not None:
-                query["sky_quality.score"]["$lte"] = max_score
-        
-        if category:
-            query["sky_quality.category"] = category
-        
-        if bortle_scale is not None:
-            query["sky_quality.bortle_scale"] = {"$lte": bortle_scale}
-        
-        if min_elevation is not None:
-            query["sky_quality.elevation"] = {"$gte": min_elevation}
-        
-        if search:
-            query["name"] = {"$regex": search, "$options": "i"}
-        
-        cursor = spots_collection.find(query).sort("sky_quality.score", -1).skip(skip).limit(limit)
-        
-        spots = []
-        for doc in cursor:
-            doc["_id"] = str(doc["_id"])
-            if "created_at" in doc and isinstance(doc["created_at"], datetime):
-                doc["created_at"] = doc["created_at"].isoformat()
-            spots.append(doc)
-        
-        total_count = spots_collection.count_documents(query)
-        
-        return {
-            "spots": spots,
-            "total": total_count,
-            "skip": skip,
-            "limit": limit,
-            "filters_applied": {
-                "min_score": min_score,
-                "max_score": max_score,
-                "category": category,
-                "bortle_scale": bortle_scale,
-                "min_elevation": min_elevation,
-                "search": search
-            }
-        }
+        return cached_json_response(
+            request,
+            spots_cache,
+            make_cache_key("list", params),
+            lambda: _find_observation_spots(**params),
+            settings.SPOTS_CACHE_MAX_AGE,
+        )
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"관측 명소 데이터 조회 중 오류 발생: {str(e)}")
@@ -102,9 +158,19 @@ async def get_nearby_observation_spots(
     현재 위치 주변의 별 관측 명소를 거리순으로 정렬하여 조회합니다.
     """
     try:
+        if settings.SPOT_INDEX_ENABLED:
+            spot_index = get_spot_index()
+            await spot_index.refresh(get_spots_collection())
+            nearby_spots = spot_index.nearby(get_spots_collection(), lat, lon, radius, limit, min_score)
+            return {
+                "spots": nearby_spots,
+                "total": len(nearby_spots),
+                "location": {"latitude": lat, "longitude": lon, "radius_km": radius}
+            }
+
         # GeoJSON 형태로 위치 정보가 저장되어 있을때 MongoDB의 공간 쿼리 사용
         # 모든 명소 데이터 조회
-        spots = list(spots_collection.find({}))
+        spots = list(get_spots_collection().find({}, SEARCH_FIELDS_PROJECTION))
         
         nearby_spots = []       # 거리 계산 + 필터링 
         for spot in spots:
@@ -139,8 +205,46 @@ async def get_nearby_observation_spots(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"주변 관측 명소 조회 중 오류 발생: {str(e)}")
 
+def _find_best_observation_spots(limit, category, bortle_max):
+    if settings.SPOT_INDEX_ENABLED:
+        best_spots = get_spot_index().best(get_spots_collection(), limit, bortle_max, category)
+        return {
+            "spots": best_spots,
+            "total": len(best_spots),
+            "criteria": {
+                "bortle_max": bortle_max,
+                "category": category
+            }
+        }
+
+    query = {}
+
+    query["sky_quality.bortle_scale"] = {"$lte": bortle_max}
+    
+    if category:
+        query["sky_quality.category"] = category
+    
+    cursor = get_spots_collection().find(query, SEARCH_FIELDS_PROJECTION).sort("sky_quality.score", -1).limit(limit)  # 별 관측 품질 점수 기준으로 정렬하여 조회
+    
+    best_spots = []
+    for spot in cursor:
+        spot["_id"] = str(spot["_id"])
+        if "created_at" in spot and isinstance(spot["created_at"], datetime):
+            spot["created_at"] = spot["created_at"].isoformat()
+        best_spots.append(spot)
+    
+    return {
+        "spots": best_spots,
+        "total": len(best_spots),
+        "criteria": {
+            "bortle_max": bortle_max,
+            "category": category
+        }
+    }
+
 @router.get("/observation-spots/best", summary="추천 관측 명소")
 async def get_best_observation_spots(
+    request: Request,
     limit: int = Query(5, ge=1, le=20, description="반환할 명소 수"),
     category: Optional[str] = Query(None, description="별 관측 품질 카테고리"),
     bortle_max: int = Query(4, ge=1, le=9, description="최대 Bortle 등급 (낮을수록 좋음)")
@@ -151,92 +255,130 @@ async def get_best_observation_spots(
     가장 별 관측 조건이 좋은 장소들을 추천합니다.
     """
     try:
-        query = {}
+        if settings.SPOT_INDEX_ENABLED:
+            await get_spot_index().refresh(get_spots_collection())
+        return cached_json_response(
+            request,
+            spots_cache,
+            make_cache_key("best", {"limit": limit, "category": category, "bortle_max": bortle_max}),
+            lambda: _find_best_observation_spots(limit, category, bortle_max),
+            settings.SPOTS_CACHE_MAX_AGE,
+        )
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"추천 관측 명소 조회 중 오류 발생: {str(e)}")
 
-        query["sky_quality.bortle_scale"] = {"$lte": bortle_max}
-        
-        if category:
-            query["sky_quality.category"] = category
-        
-        cursor = spots_collection.find(query).sort("sky_quality.score", -1).limit(limit)  # 별 관측 품질 점수 기준으로 정렬하여 조회
-        
-        best_spots = []
-        for spot in cursor:
-            spot["_id"] = str(spot["_id"])
-            if "created_at" in spot and isinstance(spot["created_at"], datetime):
-                spot["created_at"] = spot["created_at"].isoformat()
-            best_spots.append(spot)
-        
-        return {
-            "spots": best_spots,
-            "total": len(best_spots),
-            "criteria": {
-                "bortle_max": bortle_max,
-                "category": category
+def _aggregate_observation_spots_by_category():
+    # 집계 파이프라인 구성
+    pipeline = [
+        {
+            "$group": {
+                "_id": "$sky_quality.category",
+                "count": {"$sum": 1},
+                "avg_score": {"$avg": "$sky_quality.score"},
+                "avg_bortle": {"$avg": "$sky_quality.bortle_scale"},
+                "avg_sqm": {"$avg": "$sky_quality.sqm"},
+                "min_score": {"$min": "$sky_quality.score"},
+                "max_score": {"$max": "$sky_quality.score"}
             }
+        },
+        {
+            "$sort": {"_id": 1}
         }
+    ]
     
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"추천 관측 명소 조회 중 오류 발생: {str(e)}")
+    result = list(get_spots_collection().aggregate(pipeline))
+    
+    categories = []
+    for item in result:
+        categories.append({
+            "category": item["_id"],
+            "count": item["count"],
+            "avg_score": round(item["avg_score"], 1),
+            "avg_bortle": round(item["avg_bortle"], 1),
+            "avg_sqm": round(item["avg_sqm"], 2),
+            "score_range": {
+                "min": round(item["min_score"], 1),
+                "max": round(item["max_score"], 1)
+            }
+        })
+    
+    total_count = get_spots_collection().count_documents({})
+    avg_score = get_spots_collection().aggregate([
+        {"$group": {"_id": None, "avg": {"$avg": "$sky_quality.score"}}}
+    ])
+    avg_score = list(avg_score)
+    avg_score_value = round(avg_score[0]["avg"], 1) if avg_score else None
+    
+    return {
+        "categories": categories,
+        "total_spots": total_count,
+        "avg_overall_score": avg_score_value
+    }
 
 @router.get("/observation-spots/categories", summary="카테고리별 명소 수")
-async def get_observation_spots_by_category():
+async def get_observation_spots_by_category(request: Request):
     """
     카테고리별 관측 명소 통계
     
     별 관측 품질 카테고리별 명소 개수와 통계를 제공합니다.
     """
-    try:    # 집계 파이프라인 구성
-        pipeline = [
-            {
-                "$group": {
-                    "_id": "$sky_quality.category",
-                    "count": {"$sum": 1},
-                    "avg_score": {"$avg": "$sky_quality.score"},
-                    "avg_bortle": {"$avg": "$sky_quality.bortle_scale"},
-                    "avg_sqm": {"$avg": "$sky_quality.sqm"},
-                    "min_score": {"$min": "$sky_quality.score"},
-                    "max_score": {"$max": "$sky_quality.score"}
-                }
-            },
-            {
-                "$sort": {"_id": 1}
-            }
-        ]
-        
-        result = list(spots_collection.aggregate(pipeline))
-    
-        categories = []
-        for item in result:
-            categories.append({
-                "category": item["_id"],
-                "count": item["count"],
-                "avg_score": round(item["avg_score"], 1),
-                "avg_bortle": round(item["avg_bortle"], 1),
-                "avg_sqm": round(item["avg_sqm"], 2),
-                "score_range": {
-                    "min": round(item["min_score"], 1),
-                    "max": round(item["max_score"], 1)
-                }
-            })
-        
-        total_count = spots_collection.count_documents({})
-        avg_score = spots_collection.aggregate([
-            {"$group": {"_id": None, "avg": {"$avg": "$sky_quality.score"}}}
-        ])
-        avg_score_value = round(list(avg_score)[0]["avg"], 1) if list(avg_score) else None
-        
-        return {
-            "categories": categories,
-            "total_spots": total_count,
-            "avg_overall_score": avg_score_value
-        }
+    try:
+        return cached_json_response(
+            request,
+            spots_cache,
+            make_cache_key("categories", {}),
+            _aggregate_observation_spots_by_category,
+            settings.SPOTS_CACHE_MAX_AGE,
+        )
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"카테고리별 통계 조회 중 오류 발생: {str(e)}")
 
+def _autocomplete_observation_spots(q, limit):
+    cursor = get_spots_collection().find(
+        build_autocomplete_query(q),
+        {"name": 1, "sky_quality.score": 1, "sky_quality.category": 1},
+    ).sort("sky_quality.score", -1).limit(limit)
+
+    suggestions = []
+    for doc in cursor:
+        sky_quality = doc.get("sky_quality", {})
+        suggestions.append({
+            "_id": str(doc["_id"]),
+            "name": doc.get("name"),
+            "score": sky_quality.get("score"),
+            "category": sky_quality.get("category")
+        })
+
+    return {"query": q, "suggestions": suggestions}
+
+@router.get("/observation-spots/autocomplete", summary="관측 명소 이름 자동완성")
+async def autocomplete_observation_spots(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=50, description="장소 이름 접두어"),
+    limit: int = Query(10, ge=1, le=20, description="반환할 최대 결과 수")
+):
+    """
+    관측 명소 이름 자동완성
+    
+    입력한 접두어로 시작하는 명소를 별 관측 품질 점수가 높은 순으로 반환합니다.
+    """
+    try:
+        return cached_json_response(
+            request,
+            spots_cache,
+            make_cache_key("autocomplete", {"q": normalize_name(q), "limit": limit}),
+            lambda: _autocomplete_observation_spots(q, limit),
+            settings.SPOTS_CACHE_MAX_AGE,
+        )
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"자동완성 조회 중 오류 발생: {str(e)}")
+
 @router.get("/observation-spots/{spot_id}", summary="관측 명소 상세")
 async def get_observation_spot_by_id(
+    request: Request,
     spot_id: str = Path(..., description="관측 명소 ID")
 ):
     """
@@ -248,17 +390,26 @@ async def get_observation_spot_by_id(
         if not ObjectId.is_valid(spot_id):
             raise HTTPException(status_code=400, detail="유효하지 않은 ID 형식입니다")
         
-        spot = spots_collection.find_one({"_id": ObjectId(spot_id)})
-        
-        if not spot:
-            raise HTTPException(status_code=404, detail="해당 ID의 관측 명소를 찾을 수 없습니다")
-        
-        spot["_id"] = str(spot["_id"])
+        def find_spot():
+            spot = get_spots_collection().find_one({"_id": ObjectId(spot_id)}, SEARCH_FIELDS_PROJECTION)
+            
+            if not spot:
+                raise HTTPException(status_code=404, detail="해당 ID의 관측 명소를 찾을 수 없습니다")
+            
+            spot["_id"] = str(spot["_id"])
 
-        if "created_at" in spot and isinstance(spot["created_at"], datetime):
-            spot["created_at"] = spot["created_at"].isoformat()
-        
-        return spot
+            if "created_at" in spot and isinstance(spot["created_at"], datetime):
+                spot["created_at"] = spot["created_at"].isoformat()
+            
+            return spot
+
+        return cached_json_response(
+            request,
+            spots_cache,
+            make_cache_key(f"detail:{spot_id}", {}),
+            find_spot,
+            settings.SPOTS_CACHE_MAX_AGE,
+        )
     
     except HTTPException:
         raise
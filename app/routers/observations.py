@@ -1,14 +1,32 @@
 from datetime import datetime, timedelta
 from fastapi import APIRouter, File, Form, HTTPException, UploadFile, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from app.config import settings
+from math import radians, cos, sin, asin, sqrt
+import asyncio
+import csv
+import io
+import json
 import os
-import shutil
 import uuid
 from bson import ObjectId
 from pydantic import BaseModel, Field
 from typing import List, Optional
-from app.services.star_counter import star_counter  
-from pymongo import MongoClient
+from app.services.cpu_budget import cpu_budget
+from app.services.database import get_db
+from app.services.image_hash import compute_star_hash, find_near_duplicate, hash_bands
+from app.services.rollups import ensure_rollup_indexes, get_trend, record_observations
+from app.services.star_detectors import resolve_engine_name
+from app.services.upload_validation import (
+    UNREADABLE_IMAGE_DETAIL,
+    UnreadableImageError,
+    check_extension,
+    save_validated_upload,
+)
+from pymongo import ASCENDING, DESCENDING
+from pymongo.collection import Collection
+from pymongo.database import Database
 
 router = APIRouter(
     prefix="/api",
@@ -16,9 +34,83 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-client = MongoClient("mongodb://localhost:27017/")
-db = client["counting_stars"]
-observations_collection = db["observations"]  
+def get_observations_collection(db: Database = None) -> Collection:
+    return (db if db is not None else get_db())["observations"]
+
+def ensure_observation_indexes(db: Database):
+    """앱 시작 시 호출되는 관측 데이터 컬렉션 인덱스 설정"""
+    # 최신순 조회/내보내기 정렬용 인덱스
+    try:
+        get_observations_collection(db).create_index([("uploaded_at", DESCENDING)])
+    except Exception:
+        pass
+
+    # 중복 사진 조회용 해시 밴드 인덱스
+    try:
+        get_observations_collection(db).create_index([("image_hash_bands", ASCENDING), ("uploaded_at", DESCENDING)])
+    except Exception:
+        pass
+
+    # 지역별 별 개수 추이 집계 인덱스
+    try:
+        ensure_rollup_indexes(db)
+    except Exception:
+        pass
+
+def star_counter():
+    """OpenCV와 StarCounter는 import 시점이 아니라 처음 분석할 때 로드"""
+    from app.services.star_counter import get_star_counter
+    return get_star_counter()
+
+def resolve_engine(engine: Optional[str]) -> str:
+    """요청한 별 검출 엔진이 등록된 엔진인지 확인 (생략하면 STAR_DETECTOR_ENGINE, OpenCV는 로드하지 않음)"""
+    try:
+        return resolve_engine_name(engine)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# 워커당 동시에 실행되는 별 분석 수 제한 (나머지 코어는 OpenCV 내부 스레드 몫)
+# 실행 중인 이벤트 루프에 묶이도록 첫 분석 요청에서 생성
+analysis_semaphore = None
+
+async def count_stars(file_path: str, engine: Optional[str] = None) -> dict:
+    """이벤트 루프를 막지 않도록 스레드풀에서 별 개수 분석 실행 (첫 분석 시 OpenCV 로드도 스레드풀에서 수행)"""
+    global analysis_semaphore
+    if analysis_semaphore is None:
+        analysis_semaphore = asyncio.Semaphore(cpu_budget.analysis_concurrency)
+    async with analysis_semaphore:
+        return await run_in_threadpool(lambda: star_counter().count_stars(file_path, engine=engine))
+
+def record_rollups(observation: dict):
+    """일별/월별 집계 갱신 (실패해도 관측 데이터 저장은 유지)"""
+    try:
+        record_observations(get_db(), [observation])
+    except Exception as e:
+        print(f"관측 집계 갱신 실패: {e}")
+
+async def analyze_observation_image(file_path: str, latitude: float, longitude: float, engine: Optional[str] = None):
+    """
+    같은 장소/시간대에 거의 같은 사진이 이미 있으면 그 분석 결과를 재사용하고, 없으면 별 개수를 분석
+
+    Returns:
+        Tuple: (분석 결과, 관측 데이터에 함께 저장할 해시/중복 정보)
+    """
+    image_hash = await run_in_threadpool(compute_star_hash, file_path)
+    if image_hash is None:
+        return await count_stars(file_path, engine), {}
+
+    hash_fields = {"image_hash": image_hash, "image_hash_bands": hash_bands(image_hash)}
+    duplicate = find_near_duplicate(get_observations_collection(), image_hash, latitude, longitude)
+    if duplicate:
+        print(f"중복 사진 감지: {duplicate['_id']} (해밍 거리 {duplicate['hash_distance']})")
+        hash_fields["duplicate_of"] = str(duplicate["_id"])
+        hash_fields["hash_distance"] = duplicate["hash_distance"]
+        # 같은 엔진으로 분석한 결과만 재사용 (engine 필드가 없는 기존 데이터는 contour 엔진 결과)
+        previous = duplicate["image_analysis"]
+        if previous.get("engine", "contour") == (engine or settings.STAR_DETECTOR_ENGINE):
+            return previous, hash_fields
+
+    return await count_stars(file_path, engine), hash_fields
 
 @router.post("/upload", summary="사용자 입력 API")
 async def upload(
@@ -28,6 +120,7 @@ async def upload(
     title: str = Form(...),
     content: str = Form(...),
     manual_star_count_range: str = Form(...),
+    engine: Optional[str] = Form(None, description="별 검출 엔진 (StarCounter에 등록된 이름, 예: contour, peaks), 생략하면 서버 기본값"),
 ):
     """
     밤하늘 사진 업로드 및 별 개수 분석 API (MongoDB 저장)
@@ -36,19 +129,17 @@ async def upload(
     print(f"글 제목: {title}, 글 내용: {content}")
     print(f"사용자 직접 입력 별 개수 범위: {manual_star_count_range}")
 
-    file_extension = os.path.splitext(image.filename)[1]
-    if file_extension.lower() not in ['.jpg', '.jpeg', '.png']:
-        raise HTTPException(status_code=400, detail="지원되지 않는 파일 형식입니다. JPG 또는 PNG 이미지만 업로드 가능합니다.")
+    file_extension = check_extension(image.filename)
+    engine = resolve_engine(engine)
 
     unique_filename = f"{uuid.uuid4()}{file_extension}"
     file_path = os.path.join(settings.UPLOAD_DIR, unique_filename)
 
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(image.file, buffer)
-        print("파일이 저장되었습니다")
+    await save_validated_upload(image, file_path)
+    print("파일이 저장되었습니다")
 
     try:
-        analysis_result = star_counter.count_stars(file_path)
+        analysis_result, hash_fields = await analyze_observation_image(file_path, latitude, longitude, engine)
         star_count_from_analysis = analysis_result.get("star_count", 0)
         star_category_from_analysis = analysis_result.get("star_category")
         ui_message_from_analysis = analysis_result.get("ui_message")
@@ -70,6 +161,7 @@ async def upload(
                 "star_count": star_count_from_analysis,
                 "star_category": star_category_from_analysis,
                 "ui_message": ui_message_from_analysis,
+                "engine": analysis_result.get("engine"),
             },
             "user_input": {
                 "title": title,
@@ -81,19 +173,26 @@ async def upload(
             "longitude": longitude,
             "image_url": image_url,
             "filename": unique_filename,
-            "uploaded_at": datetime.now()  
+            "uploaded_at": datetime.now(),
+            **hash_fields
         }
 
         # MongoDB에 데이터 삽입
-        inserted_result = observations_collection.insert_one(observation_data)
+        inserted_result = get_observations_collection().insert_one(observation_data)
         inserted_id = str(inserted_result.inserted_id)
         print(f"MongoDB에 데이터 저장 완료. ObjectId: {inserted_id}")
+        record_rollups(observation_data)
 
         # 저장된 데이터와 ObjectId를 포함한 응답 반환 
         final_result = observation_data
         final_result["_id"] = inserted_id
+        final_result.pop("image_hash_bands", None)
         return final_result
 
+    except UnreadableImageError:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise HTTPException(status_code=400, detail=UNREADABLE_IMAGE_DETAIL)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"별 개수 분석 오류: {str(e)}")
 
@@ -122,6 +221,7 @@ class ObservationModel(BaseModel):
     longitude: float
     image_url: Optional[str] = None
     uploaded_at: datetime
+    duplicate_of: Optional[str] = None
     
     class Config:
         allow_population_by_field_name = True
@@ -141,6 +241,42 @@ class ObservationsListModel(BaseModel):
             datetime: lambda dt: dt.isoformat()
         }
 
+def haversine(lat1, lon1, lat2, lon2):
+    """
+    두 지점 간 거리 계산 (km)
+    """
+    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
+    c = 2 * asin(sqrt(a))
+    r = 6371 
+    return c * r
+
+def build_observations_query(min_stars=None, max_stars=None, category=None, days=None, include_duplicates=True):
+    """관측 데이터 목록/내보내기 공통 필터 구성"""
+    query = {}
+
+    if not include_duplicates:
+        query["duplicate_of"] = {"$exists": False}
+
+    if min_stars is not None or max_stars is not None:
+        query["image_analysis.star_count"] = {}
+        if min_stars is not None:
+            query["image_analysis.star_count"]["$gte"] = min_stars
+        if max_stars is not None:
+            query["image_analysis.star_count"]["$lte"] = max_stars
+    
+    if category:
+        query["image_analysis.star_category"] = category
+    
+    if days:
+        date_threshold = datetime.now() - timedelta(days=days)
+        query["uploaded_at"] = {"$gte": date_threshold}
+
+    return query
+
 @router.get("/observations", response_model=ObservationsListModel, summary="모든 관측 데이터 조회 API")
 async def get_all_observations(
     skip: int = Query(0, ge=0),
@@ -151,7 +287,8 @@ async def get_all_observations(
     lat: Optional[float] = Query(None),
     lon: Optional[float] = Query(None),
     distance: Optional[float] = Query(None, ge=0),  # km 단위
-    days: Optional[int] = Query(None, ge=1)
+    days: Optional[int] = Query(None, ge=1),
+    include_duplicates: bool = Query(True)
 ):
     """
     모든 관측 데이터를 조회하는 API
@@ -165,26 +302,13 @@ async def get_all_observations(
     - **lon**: 중심 경도 (거리 기반 검색 시)
     - **distance**: 검색 반경 (km)
     - **days**: 지정된 일수 이내의 데이터만 조회
+    - **include_duplicates**: 중복 사진으로 판정된 관측 데이터 포함 여부 (기본값 true, 중복 데이터는 duplicate_of로 표시됨)
     """
     try:
-        query = {}
-    
-        if min_stars is not None or max_stars is not None:
-            query["image_analysis.star_count"] = {}
-            if min_stars is not None:
-                query["image_analysis.star_count"]["$gte"] = min_stars
-            if max_stars is not None:
-                query["image_analysis.star_count"]["$lte"] = max_stars
+        query = build_observations_query(min_stars, max_stars, category, days, include_duplicates)
         
-        if category:
-            query["image_analysis.star_category"] = category
-        
-        if days:
-            date_threshold = datetime.now() - timedelta(days=days)
-            query["uploaded_at"] = {"$gte": date_threshold}
-        
-        total = observations_collection.count_documents(query)
-        cursor = observations_collection.find(query).sort("uploaded_at", -1).skip(skip).limit(limit)
+        total = get_observations_collection().count_documents(query)
+        cursor = get_observations_collection().find(query).sort("uploaded_at", -1).skip(skip).limit(limit)
         
         observations = []
         for doc in cursor:
@@ -192,21 +316,6 @@ async def get_all_observations(
             observations.append(doc)
         
         if lat is not None and lon is not None and distance is not None:
-            from math import radians, cos, sin, asin, sqrt
-            
-            def haversine(lat1, lon1, lat2, lon2):
-                """
-                두 지점 간 거리 계산 (km)
-                """
-                lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-
-                dlon = lon2 - lon1
-                dlat = lat2 - lat1
-                a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-                c = 2 * asin(sqrt(a))
-                r = 6371 
-                return c * r
-            
             filtered_observations = []
             for obs in observations:
                 obs_lat = obs["latitude"]
@@ -224,6 +333,156 @@ async def get_all_observations(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"데이터 조회 중 오류 발생: {str(e)}")
 
+EXPORT_CSV_COLUMNS = [
+    "_id", "uploaded_at", "latitude", "longitude", "star_count", "star_category", "engine",
+    "manual_star_count_range", "manual_star_count", "title", "content", "image_url", "duplicate_of",
+]
+
+def _export_row(doc):
+    analysis = doc.get("image_analysis") or {}
+    user_input = doc.get("user_input") or {}
+    uploaded_at = doc.get("uploaded_at")
+    return {
+        "_id": str(doc["_id"]),
+        "uploaded_at": uploaded_at.isoformat() if isinstance(uploaded_at, datetime) else uploaded_at,
+        "latitude": doc.get("latitude"),
+        "longitude": doc.get("longitude"),
+        "star_count": analysis.get("star_count"),
+        "star_category": analysis.get("star_category"),
+        "engine": analysis.get("engine"),
+        "manual_star_count_range": user_input.get("manual_star_count_range"),
+        "manual_star_count": user_input.get("manual_star_count"),
+        "title": user_input.get("title"),
+        "content": user_input.get("content"),
+        "image_url": doc.get("image_url"),
+        "duplicate_of": doc.get("duplicate_of"),
+    }
+
+def _iter_export(cursor, fmt, center=None, flush_rows=500):
+    """
+    커서를 순회하며 NDJSON/CSV 텍스트 조각을 생성
+
+    flush_rows개 행마다 한 번씩 내보내므로 메모리 사용량은 전체 행 수와 무관합니다.
+    """
+    buffer = io.StringIO()
+    writer = None
+    if fmt == "csv":
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_CSV_COLUMNS + (["distance"] if center else []))
+        writer.writeheader()
+
+    rows = 0
+    try:
+        for doc in cursor:
+            row = _export_row(doc)
+            if center:
+                lat, lon, max_distance = center
+                if row["latitude"] is None or row["longitude"] is None:
+                    continue
+                dist = haversine(lat, lon, row["latitude"], row["longitude"])
+                if dist > max_distance:
+                    continue
+                row["distance"] = round(dist, 2)
+
+            if writer:
+                writer.writerow(row)
+            else:
+                buffer.write(json.dumps(row, ensure_ascii=False))
+                buffer.write("\n")
+
+            rows += 1
+            if rows % flush_rows == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        cursor.close()
+
+@router.get("/observations/export", summary="관측 데이터 내보내기 API")
+def export_observations(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="내보내기 형식 (ndjson, csv)"),
+    min_stars: Optional[int] = Query(None, ge=0),
+    max_stars: Optional[int] = Query(None, ge=0),
+    category: Optional[str] = Query(None),
+    lat: Optional[float] = Query(None),
+    lon: Optional[float] = Query(None),
+    distance: Optional[float] = Query(None, ge=0),  # km 단위
+    days: Optional[int] = Query(None, ge=1),
+    min_lat: Optional[float] = Query(None, ge=-90, le=90),
+    max_lat: Optional[float] = Query(None, ge=-90, le=90),
+    min_lon: Optional[float] = Query(None, ge=-180, le=180),
+    max_lon: Optional[float] = Query(None, ge=-180, le=180),
+    start: Optional[datetime] = Query(None, description="시작 시각 (ISO 8601)"),
+    end: Optional[datetime] = Query(None, description="종료 시각 (ISO 8601)"),
+    include_duplicates: bool = Query(True, description="중복 사진으로 판정된 관측 데이터 포함 여부 (false면 duplicate_of가 있는 데이터 제외)"),
+):
+    """
+    관측 데이터 전체를 NDJSON 또는 CSV로 스트리밍 내보내기
+
+    - **min_stars / max_stars / category / lat / lon / distance / days**: 목록 조회 API와 동일한 필터
+    - **min_lat / max_lat / min_lon / max_lon**: 영역(bounding box) 필터
+    - **start / end**: 업로드 시각 범위 필터
+    """
+    query = build_observations_query(min_stars, max_stars, category, days, include_duplicates)
+
+    for field, low, high in (("latitude", min_lat, max_lat), ("longitude", min_lon, max_lon)):
+        if low is not None or high is not None:
+            query[field] = {}
+            if low is not None:
+                query[field]["$gte"] = low
+            if high is not None:
+                query[field]["$lte"] = high
+
+    if start is not None or end is not None:
+        # uploaded_at은 서버 로컬 시각(naive)으로 저장되어 있으므로 맞춰서 비교
+        uploaded_at = query.setdefault("uploaded_at", {})
+        if start is not None:
+            start = start.astimezone().replace(tzinfo=None) if start.tzinfo else start
+            uploaded_at["$gte"] = max(start, uploaded_at.get("$gte", start))
+        if end is not None:
+            uploaded_at["$lte"] = end.astimezone().replace(tzinfo=None) if end.tzinfo else end
+
+    center = None
+    if lat is not None and lon is not None and distance is not None:
+        center = (lat, lon, distance)
+
+    try:
+        cursor = get_observations_collection().find(query).sort("uploaded_at", -1).batch_size(settings.EXPORT_BATCH_SIZE)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"데이터 내보내기 중 오류 발생: {str(e)}")
+
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    media_type = "text/csv; charset=utf-8" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _iter_export(cursor, format, center),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="observations_{timestamp}.{format}"'},
+    )
+
+@router.get("/observations/trend", summary="지역별 별 개수 추이 API")
+async def get_observation_trend(
+    lat: float = Query(..., ge=-90, le=90, description="위도"),
+    lon: float = Query(..., ge=-180, le=180, description="경도"),
+    period: str = Query("day", pattern="^(day|month)$", description="집계 단위 (day, month)"),
+    start: Optional[datetime] = Query(None, description="시작 시각 (ISO 8601)"),
+    end: Optional[datetime] = Query(None, description="종료 시각 (ISO 8601)"),
+):
+    """
+    위치가 속한 격자 셀의 일별/월별 별 개수 추이
+
+    관측 데이터 저장 시 미리 갱신해 둔 집계 문서만 읽어 응답합니다.
+    """
+    try:
+        if start is not None and start.tzinfo:
+            start = start.astimezone().replace(tzinfo=None)
+        if end is not None and end.tzinfo:
+            end = end.astimezone().replace(tzinfo=None)
+        return get_trend(get_db(), lat, lon, period, start, end)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"추이 조회 중 오류 발생: {str(e)}")
+
 @router.get("/observations/{observation_id}", response_model=ObservationModel, summary="특정 위치의 관측 데이터 조회 API")
 async def get_observation_by_id(observation_id: str):
     """
@@ -235,7 +494,7 @@ async def get_observation_by_id(observation_id: str):
         except Exception:
             raise HTTPException(status_code=400, detail="유효하지 않은 ID 형식입니다")
     
-        observation = observations_collection.find_one({"_id": obj_id})
+        observation = get_observations_collection().find_one({"_id": obj_id})
         
         if observation:
             observation["_id"] = str(observation["_id"])
@@ -252,26 +511,25 @@ async def get_observation_by_id(observation_id: str):
 @router.post("/analyze-image", summary="밤하늘 이미지 분석")
 async def analyze_image(
     image: UploadFile = File(...),
+    engine: Optional[str] = Form(None, description="별 검출 엔진 (StarCounter에 등록된 이름, 예: contour, peaks), 생략하면 서버 기본값"),
 ):
     """
     밤하늘 사진을 분석하여 별 개수와 관측 품질을 판단합니다.
     분석 결과를 확인 후 최종 업로드 여부를 결정할 수 있습니다.
     """
-    file_extension = os.path.splitext(image.filename)[1]
-    if file_extension.lower() not in ['.jpg', '.jpeg', '.png']:
-        raise HTTPException(status_code=400, detail="지원되지 않는 파일 형식입니다. JPG 또는 PNG 이미지만 업로드 가능합니다.")
+    file_extension = check_extension(image.filename)
+    engine = resolve_engine(engine)
 
     # 임시 파일명 생성 (24시간 후 자동 삭제되는 임시 파일로 가정)
     temp_id = uuid.uuid4()
     unique_filename = f"temp_{temp_id}{file_extension}"
     file_path = os.path.join(settings.UPLOAD_DIR, unique_filename)
 
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(image.file, buffer)
+    await save_validated_upload(image, file_path)
 
     try:
         # 이미지 분석 수행
-        analysis_result = star_counter.count_stars(file_path)
+        analysis_result = await count_stars(file_path, engine)
         
         # 분석 결과와 임시 파일 정보 반환
         return {
@@ -281,11 +539,14 @@ async def analyze_image(
                 "star_count": analysis_result.get("star_count", 0),
                 "star_category": analysis_result.get("star_category"),
                 "ui_message": analysis_result.get("ui_message"),
+                "engine": analysis_result.get("engine"),
             }
         }
     except Exception as e:
         if os.path.exists(file_path):
             os.remove(file_path)
+        if isinstance(e, UnreadableImageError):
+            raise HTTPException(status_code=400, detail=UNREADABLE_IMAGE_DETAIL)
         raise HTTPException(status_code=500, detail=f"별 개수 분석 오류: {str(e)}")
 
 # 최종 업로드 API - 분석 결과를 확인한 후 최종 저장
@@ -297,10 +558,13 @@ async def confirm_upload(
     title: str = Form(..., description="게시글 제목"),
     content: str = Form(..., description="게시글 내용"),
     manual_star_count_range: str = Form(..., description="사용자 직접 입력 별 개수 범위"),
+    engine: Optional[str] = Form(None, description="별 검출 엔진 (StarCounter에 등록된 이름, 예: contour, peaks), 생략하면 서버 기본값"),
 ):
     """
     분석한 이미지의 최종 업로드를 확정합니다.
     """
+    engine = resolve_engine(engine)
+
     # 임시 파일 확인
     temp_filename = f"temp_{temp_id}"
     found_files = [f for f in os.listdir(settings.UPLOAD_DIR) if f.startswith(temp_filename)]
@@ -311,8 +575,8 @@ async def confirm_upload(
     temp_file_path = os.path.join(settings.UPLOAD_DIR, found_files[0])
     
     try:
-        # 별 개수 분석 결과 다시 가져오기
-        analysis_result = star_counter.count_stars(temp_file_path)
+        # 별 개수 분석 결과 다시 가져오기 (중복 사진이면 기존 분석 결과 재사용)
+        analysis_result, hash_fields = await analyze_observation_image(temp_file_path, latitude, longitude, engine)
         star_count_from_analysis = analysis_result.get("star_count", 0)
         star_category_from_analysis = analysis_result.get("star_category")
         ui_message_from_analysis = analysis_result.get("ui_message")
@@ -342,6 +606,7 @@ async def confirm_upload(
                 "star_count": star_count_from_analysis,
                 "star_category": star_category_from_analysis,
                 "ui_message": ui_message_from_analysis,
+                "engine": analysis_result.get("engine"),
             },
             "user_input": {
                 "title": title,
@@ -353,17 +618,22 @@ async def confirm_upload(
             "longitude": longitude,
             "image_url": image_url,
             "filename": unique_filename,
-            "uploaded_at": datetime.now()
+            "uploaded_at": datetime.now(),
+            **hash_fields
         }
         
-        inserted_result = observations_collection.insert_one(observation_data)
+        inserted_result = get_observations_collection().insert_one(observation_data)
         inserted_id = str(inserted_result.inserted_id)
+        record_rollups(observation_data)
         
         final_result = observation_data
         final_result["_id"] = inserted_id
+        final_result.pop("image_hash_bands", None)
         return final_result
         
     except Exception as e:
         if os.path.exists(temp_file_path):
             os.remove(temp_file_path)
+        if isinstance(e, UnreadableImageError):
+            raise HTTPException(status_code=400, detail=UNREADABLE_IMAGE_DETAIL)
         raise HTTPException(status_code=500, detail=f"데이터 저장 오류: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,177 @@
+from app.config import settings
+from dataclasses import dataclass
+from typing import List, Optional
+import argparse
+import logging
+import math
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_limit() -> Optional[float]:
+    """cgroup(v2/v1)에 설정된 CPU 할당량 (제한이 없으면 None)"""
+    cpu_max = _read("/sys/fs/cgroup/cpu.max")
+    if cpu_max:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+        return None
+
+    quota = _read("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+    period = _read("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def detect_cpu_count() -> int:
+    """프로세스가 실제로 사용할 수 있는 CPU 수 (affinity와 cgroup 제한 반영)"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    limit = cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, max(1, math.floor(limit)))
+    return max(1, cpus)
+
+
+@dataclass(frozen=True)
+class CpuBudget:
+    """
+    CPU 코어를 uvicorn 워커, 워커별 동시 분석 수, OpenCV 내부 스레드로 나눈 결과
+
+    workers * analysis_concurrency * opencv_threads가 cpus를 넘지 않도록 맞춥니다.
+    """
+    cpus: int
+    workers: int
+    analysis_concurrency: int
+    opencv_threads: int
+
+
+def resolve_cpu_budget(cpus: Optional[int] = None, workers: Optional[int] = None,
+                       analysis_concurrency: Optional[int] = None,
+                       opencv_threads: Optional[int] = None) -> CpuBudget:
+    """
+    설정값(0 또는 None은 자동)으로 CPU 예산 계산
+
+    워커당 몫(cpus // workers)을 먼저 정하고, 동시 분석 수를 정한 뒤 남은 코어를 OpenCV 스레드로 배분합니다.
+    """
+    cpus = cpus or settings.CPU_LIMIT or detect_cpu_count()
+    workers = workers or settings.WEB_CONCURRENCY or 1
+    share = max(1, cpus // workers)
+
+    analysis_concurrency = analysis_concurrency or settings.ANALYSIS_CONCURRENCY or (1 if share < 4 else 2)
+    opencv_threads = opencv_threads or settings.OPENCV_THREADS or max(1, share // analysis_concurrency)
+
+    return CpuBudget(
+        cpus=cpus,
+        workers=workers,
+        analysis_concurrency=analysis_concurrency,
+        opencv_threads=opencv_threads,
+    )
+
+
+cpu_budget = resolve_cpu_budget()
+
+
+# ---------------------------------------------------------------------------
+# 벤치마크: 동시 분석 수 x OpenCV 스레드 조합별 처리량과 p99 지연 측정
+# ---------------------------------------------------------------------------
+
+def _init_bench_worker(opencv_threads: int):
+    import cv2
+    from app.services.star_counter import get_star_counter
+    # StarCounter 생성 시 설정값으로 스레드 수를 지정하므로, 먼저 생성한 뒤 측정할 값으로 덮어씀
+    get_star_counter()
+    cv2.setNumThreads(opencv_threads)
+
+
+def _bench_task(image_path: str) -> float:
+    from app.services.star_counter import get_star_counter
+    start = time.perf_counter()
+    get_star_counter().count_stars(image_path)
+    return time.perf_counter() - start
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def run_benchmark(images: List[str], parallel_list: List[int], threads_list: List[int], requests: int) -> List[dict]:
+    """
+    parallel개의 프로세스가 각각 threads개의 OpenCV 스레드로 count_stars를 실행할 때의 성능 측정
+
+    parallel은 (uvicorn 워커 수 x 워커별 동시 분석 수)에 해당합니다.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    results = []
+    tasks = [images[i % len(images)] for i in range(requests)]
+    for parallel in parallel_list:
+        for threads in threads_list:
+            with ProcessPoolExecutor(max_workers=parallel, initializer=_init_bench_worker,
+                                     initargs=(threads,)) as executor:
+                # 워커 프로세스 예열 (첫 분석의 지연 로딩 비용 제외)
+                list(executor.map(_bench_task, images[:parallel]))
+
+                start = time.perf_counter()
+                latencies = list(executor.map(_bench_task, tasks))
+                elapsed = time.perf_counter() - start
+
+            results.append({
+                "parallel": parallel,
+                "opencv_threads": threads,
+                "total_threads": parallel * threads,
+                "throughput": round(len(tasks) / elapsed, 2),
+                "p50_ms": round(_percentile(latencies, 50) * 1000, 1),
+                "p99_ms": round(_percentile(latencies, 99) * 1000, 1),
+            })
+    return results
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU 예산 확인 및 별 분석 벤치마크")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("show", help="현재 설정으로 계산된 CPU 예산 출력")
+
+    bench = subparsers.add_parser("bench", help="동시 분석 수 x OpenCV 스레드 조합 벤치마크")
+    bench.add_argument("images", nargs="+", help="벤치마크에 사용할 이미지 파일")
+    bench.add_argument("--parallel", type=_int_list, default=None, help="동시 분석 수 목록 (예: 1,2,4)")
+    bench.add_argument("--threads", type=_int_list, default=None, help="OpenCV 스레드 수 목록 (예: 1,2,4)")
+    bench.add_argument("--requests", type=int, default=50, help="조합별 분석 요청 수")
+    args = parser.parse_args()
+
+    print(f"CPU 예산: {cpu_budget}")
+    if args.command == "show":
+        return
+
+    cpus = cpu_budget.cpus
+    powers = [n for n in (1, 2, 4, 8, 16, 32) if n <= cpus] or [1]
+    results = run_benchmark(args.images, args.parallel or powers, args.threads or powers, args.requests)
+
+    print(f"{'parallel':>8} {'threads':>7} {'total':>5} {'req/s':>8} {'p50(ms)':>9} {'p99(ms)':>9}")
+    for r in results:
+        print(f"{r['parallel']:>8} {r['opencv_threads']:>7} {r['total_threads']:>5} "
+              f"{r['throughput']:>8} {r['p50_ms']:>9} {r['p99_ms']:>9}")
+
+
+if __name__ == "__main__":
+    main()
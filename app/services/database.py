@@ -1,27 +1,49 @@
 from pymongo import MongoClient
 from pymongo.database import Database
 from fastapi import Depends
+from app.config import settings
+from typing import Callable, List
 import logging
-import os
+import threading
 
 logger = logging.getLogger(__name__)
 
-MONGO_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017/")
-MONGO_DB_NAME = os.environ.get("MONGO_DB_NAME", "counting_stars")
-
 client: MongoClient = None
 
+# 처음 연결에 성공했을 때 한 번 실행할 초기화 작업 (인덱스 생성 등)
+_initializers: List[Callable[[Database], None]] = []
+_initialized = False
+_init_lock = threading.Lock()
+
+def on_connect(initializer: Callable[[Database], None]):
+    """DB에 처음 연결된 뒤 실행할 초기화 함수 등록 (기동 시 DB가 없었어도 첫 사용 시 실행됨)"""
+    _initializers.append(initializer)
+    return initializer
+
 def connect_db():
     global client
     try:
-        logger.info(f"MongoDB 연결 시도: {MONGO_URI}")
-        client = MongoClient(MONGO_URI)
+        logger.info(f"MongoDB 연결 시도: {settings.MONGO_URI}")
+        client = MongoClient(settings.MONGO_URI, serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS)
         client.admin.command('ping') 
-        logger.info(f"MongoDB 연결 성공: {MONGO_URI}")
+        logger.info(f"MongoDB 연결 성공: {settings.MONGO_URI}")
     except Exception as e:
         logger.error(f"MongoDB 연결 실패: {e}")
+        # 다음 get_client()에서 다시 연결을 시도하도록 실패한 클라이언트는 버림
+        if client is not None:
+            client.close()
+            client = None
         raise
 
+def _initialize(db: Database):
+    global _initialized
+    with _init_lock:
+        if _initialized:
+            return
+        for initializer in _initializers:
+            initializer(db)
+        _initialized = True
+
 def close_db():
     global client
     if client:
@@ -34,4 +56,14 @@ def get_client() -> MongoClient:
     return client
 
 def get_database(client: MongoClient = Depends(get_client)) -> Database:
-    return client[MONGO_DB_NAME]
\ No newline at end of file
+    db = client[settings.MONGO_DB_NAME]
+    if not _initialized:
+        _initialize(db)
+    return db
+
+def get_db() -> Database:
+    """Depends 없이 라우터/서비스 코드에서 직접 사용할 때"""
+    db = get_client()[settings.MONGO_DB_NAME]
+    if not _initialized:
+        _initialize(db)
+    return db
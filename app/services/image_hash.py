@@ -0,0 +1,100 @@
+from app.config import settings
+from datetime import datetime, timedelta
+from typing import List, Optional
+import math
+
+HASH_BITS = 64
+BAND_BITS = 8
+NUM_BANDS = HASH_BITS // BAND_BITS
+
+HASH_IMAGE_SIZE = 256
+HASH_BACKGROUND_KERNEL = 15
+HASH_NOISE_SIGMA = 3
+HASH_DENSITY_BLUR = 4
+# 잡음의 8배 이상 밝은 픽셀이 이보다 적으면 별이 없는 사진으로 보고 해시를 만들지 않음
+HASH_MIN_STAR_PIXELS = 10
+
+
+def compute_star_hash(image_path: str) -> Optional[str]:
+    """
+    별 분포로 만든 64비트 지각 해시를 16자리 16진수 문자열로 계산
+
+    밤하늘 사진은 전체 밝기 분포(하늘 배경, 광해 그라데이션)가 비슷해서 이미지 전체로 만든
+    해시로는 구분되지 않으므로, 배경과 잡음을 뺀 별 지도의 저주파 DCT 계수로 해시를 만듭니다.
+    같은 사진을 축소/재압축하면 해밍 거리가 작고, 다른 별 사진은 배경이 같아도 거리가 큽니다.
+
+    Returns:
+        str: 해시, 이미지를 읽을 수 없거나 별이 거의 없으면 None (중복 검사 생략)
+    """
+    import cv2
+    import numpy as np
+
+    img = cv2.imread(image_path, cv2.IMREAD_REDUCED_GRAYSCALE_2)
+    if img is None:
+        return None
+
+    small = cv2.resize(img, (HASH_IMAGE_SIZE, HASH_IMAGE_SIZE), interpolation=cv2.INTER_AREA).astype(np.float32)
+    residual = small - cv2.blur(small, (HASH_BACKGROUND_KERNEL, HASH_BACKGROUND_KERNEL))
+
+    sample = residual[::2, ::2]
+    noise = max(1.4826 * float(np.median(np.abs(sample - np.median(sample)))), 1.0)
+    if np.count_nonzero(residual > 8 * noise) < HASH_MIN_STAR_PIXELS:
+        return None
+
+    # 잡음 수준을 빼서 밝은 별만 남긴 뒤 흐리게 해 별 밀도 지도를 만듦
+    stars = np.maximum(residual - HASH_NOISE_SIGMA * noise, 0)
+    density = cv2.GaussianBlur(stars, (0, 0), HASH_DENSITY_BLUR)
+    dct = cv2.dct(cv2.resize(density, (32, 32), interpolation=cv2.INTER_AREA))
+    low = dct[1:9, 1:9].flatten()
+    bits = low > np.median(low)
+
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return f"{value:016x}"
+
+
+def hash_bands(image_hash: str) -> List[str]:
+    """
+    해시를 8비트씩 나눈 밴드 목록 ("위치:값")
+
+    해밍 거리가 NUM_BANDS 미만이면 최소 한 밴드는 정확히 일치하므로,
+    밴드 필드의 멀티키 인덱스로 후보를 찾은 뒤 실제 거리를 계산하면 됩니다.
+    """
+    chars = BAND_BITS // 4
+    return [f"{i}:{image_hash[i * chars:(i + 1) * chars]}" for i in range(NUM_BANDS)]
+
+
+def hamming_distance(a: str, b: str) -> int:
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+def find_near_duplicate(collection, image_hash: str, latitude: float, longitude: float,
+                        when: Optional[datetime] = None) -> Optional[dict]:
+    """
+    같은 장소/시간대에 올라온 거의 같은 사진의 기존 관측 데이터 조회
+
+    Returns:
+        Dict: 해밍 거리가 가장 가까운 기존 관측 데이터 (hash_distance 포함), 없으면 None
+    """
+    when = when or datetime.now()
+    window = timedelta(hours=settings.DUPLICATE_WINDOW_HOURS)
+    lat_delta = settings.DUPLICATE_RADIUS_KM / 111.195
+    lon_delta = lat_delta / max(math.cos(math.radians(latitude)), 0.01)
+
+    query = {
+        "image_hash_bands": {"$in": hash_bands(image_hash)},
+        "uploaded_at": {"$gte": when - window, "$lte": when + window},
+        "latitude": {"$gte": latitude - lat_delta, "$lte": latitude + lat_delta},
+        "longitude": {"$gte": longitude - lon_delta, "$lte": longitude + lon_delta},
+        "duplicate_of": {"$exists": False},
+    }
+    projection = {"image_hash": 1, "image_analysis": 1, "image_url": 1, "filename": 1}
+
+    best = None
+    for doc in collection.find(query, projection).limit(50):
+        distance = hamming_distance(image_hash, doc["image_hash"])
+        if distance <= settings.DUPLICATE_HASH_DISTANCE and (best is None or distance < best["hash_distance"]):
+            doc["hash_distance"] = distance
+            best = doc
+    return best
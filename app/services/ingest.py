@@ -0,0 +1,312 @@
+from datetime import datetime
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+from app.services.rollups import record_observations
+from app.services.sky_quality import SKY_QUALITY_FIELDS, categorize, compute_scores
+from app.services.spot_search import search_fields
+import numpy as np
+import argparse
+import csv
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+MAX_REPORTED_ERRORS = 100
+MANUAL_STAR_COUNT = {"0": 0, "1~4": 2, "5~8": 6, "9+": 9}
+
+
+def iter_records(stream: Iterable[str], fmt: str) -> Iterator[Tuple[int, dict]]:
+    """
+    CSV/NDJSON 입력을 한 줄씩 읽어 (줄 번호, 레코드)를 반환
+
+    파일 전체를 메모리에 올리지 않도록 스트림에서 바로 읽습니다.
+    파싱할 수 없는 줄은 레코드 대신 ValueError를 반환해 거부 행으로 집계되게 합니다.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+    elif fmt == "ndjson":
+        for line_num, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_num, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_num, ValueError(f"JSON 파싱 실패: {e.msg}")
+    else:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+
+
+def _field(record: dict, name: str, *parents: str):
+    """평면(CSV) 또는 중첩(NDJSON) 레코드에서 값 조회"""
+    for parent in parents:
+        nested = record.get(parent)
+        if isinstance(nested, dict) and nested.get(name) not in (None, ""):
+            return nested[name]
+    value = record.get(name)
+    return None if value == "" else value
+
+
+def _float(record: dict, name: str, *parents: str, required: bool = False,
+           low: Optional[float] = None, high: Optional[float] = None) -> Optional[float]:
+    value = _field(record, name, *parents)
+    if value is None:
+        if required:
+            raise ValueError(f"{name} 값이 없습니다")
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} 값이 숫자가 아닙니다: {value!r}")
+    if np.isnan(value) or (low is not None and value < low) or (high is not None and value > high):
+        raise ValueError(f"{name} 값이 허용 범위를 벗어났습니다: {value}")
+    return value
+
+
+def _coordinates(record: dict) -> Tuple[float, float]:
+    latitude = _float(record, "latitude", "location", required=True, low=-90, high=90)
+    longitude = _float(record, "longitude", "location", required=True, low=-180, high=180)
+    return latitude, longitude
+
+
+def validate_spot(record: dict) -> dict:
+    """관측 명소 레코드 검증 및 저장 형식 변환"""
+    name = _field(record, "name")
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("name 값이 없습니다")
+    name = name.strip()
+    latitude, longitude = _coordinates(record)
+
+    sky_quality = {
+        "bortle_scale": _float(record, "bortle_scale", "sky_quality", low=1, high=9),
+        "sqm": _float(record, "sqm", "sky_quality", low=0, high=30),
+        "brightness": _float(record, "brightness", "sky_quality", low=0),
+        "artificial_brightness": _float(record, "artificial_brightness", "sky_quality", low=0),
+        "ratio": _float(record, "ratio", "sky_quality", low=0),
+        "elevation": _float(record, "elevation", "sky_quality", low=-500, high=9000),
+        "score": _float(record, "score", "sky_quality", low=0, high=100),
+    }
+    if all(sky_quality[field] is None for field in SKY_QUALITY_FIELDS) and sky_quality["score"] is None:
+        raise ValueError("sky_quality 지표가 하나도 없습니다")
+
+    category = _field(record, "category", "sky_quality")
+    if category is not None:
+        sky_quality["category"] = str(category)
+
+    doc = {
+        "name": name,
+        # 2dsphere 인덱스의 레거시 좌표 형식은 첫 번째 필드를 경도로 해석하므로 경도를 먼저 저장
+        "location": {"longitude": longitude, "latitude": latitude},
+        "sky_quality": {k: v for k, v in sky_quality.items() if v is not None},
+    }
+    for extra in ("address", "description", "region"):
+        value = _field(record, extra)
+        if value is not None:
+            doc[extra] = value
+    doc.update(search_fields(name))
+    return doc
+
+
+def validate_observation(record: dict) -> dict:
+    """과거 관측 데이터 레코드 검증 및 저장 형식 변환"""
+    from app.services.star_counter import StarCounter
+
+    latitude, longitude = _coordinates(record)
+    star_count = _float(record, "star_count", "image_analysis", required=True, low=0)
+    star_count = int(star_count)
+
+    uploaded_at = _field(record, "uploaded_at")
+    if uploaded_at is None:
+        raise ValueError("uploaded_at 값이 없습니다")
+    try:
+        uploaded_at = datetime.fromisoformat(str(uploaded_at))
+    except ValueError:
+        raise ValueError(f"uploaded_at 형식이 올바르지 않습니다: {uploaded_at!r}")
+
+    star_category = _field(record, "star_category", "image_analysis")
+    if star_category is None:
+        star_category = StarCounter.determine_star_count_category(star_count)
+    star_category = str(star_category)
+
+    manual_range = _field(record, "manual_star_count_range", "user_input")
+    return {
+        "image_analysis": {
+            "star_count": star_count,
+            "star_category": star_category,
+            "ui_message": StarCounter.get_star_count_message(star_count, star_category),
+        },
+        "user_input": {
+            "title": _field(record, "title", "user_input") or "",
+            "content": _field(record, "content", "user_input") or "",
+            "manual_star_count_range": manual_range,
+            "manual_star_count": MANUAL_STAR_COUNT.get(manual_range),
+        },
+        "latitude": latitude,
+        "longitude": longitude,
+        "image_url": _field(record, "image_url"),
+        "filename": _field(record, "filename"),
+        "uploaded_at": uploaded_at,
+    }
+
+
+def _score_missing(docs):
+    """점수가 없는 명소는 지표로 점수를 계산하고, 카테고리가 없는 명소는 점수로 카테고리를 채움"""
+    pending = [doc for doc in docs if "score" not in doc["sky_quality"]]
+    if pending:
+        metrics = {
+            field: np.array([doc["sky_quality"].get(field, np.nan) for doc in pending], dtype=np.float64)
+            for field in SKY_QUALITY_FIELDS
+        }
+        for doc, score in zip(pending, compute_scores(metrics)):
+            doc["sky_quality"]["score"] = float(score)
+
+    uncategorized = [doc for doc in docs if doc["sky_quality"].get("category") is None]
+    if not uncategorized:
+        return
+    scores = np.array([doc["sky_quality"]["score"] for doc in uncategorized], dtype=np.float64)
+    for doc, category in zip(uncategorized, categorize(scores)):
+        if category is not None:
+            doc["sky_quality"]["category"] = str(category)
+
+
+def _spot_operations(docs):
+    _score_missing(docs)
+    # 같은 이름의 명소는 덮어써서 카탈로그를 다시 불러와도 중복되지 않게 함
+    return [
+        UpdateOne(
+            {"name": doc["name"]},
+            {"$set": doc, "$setOnInsert": {"created_at": datetime.now()}},
+            upsert=True,
+        )
+        for doc in docs
+    ]
+
+
+def _observation_operations(docs):
+    return [InsertOne(doc) for doc in docs]
+
+
+def _after_observations_written(collection, docs):
+    # 과거 데이터도 일별/월별 집계에 반영
+    record_observations(collection.database, docs)
+
+
+KINDS = {
+    "spots": ("observation_spots", validate_spot, _spot_operations, None),
+    "observations": ("observations", validate_observation, _observation_operations, _after_observations_written),
+}
+
+
+def ingest(records: Iterable[Tuple[int, dict]], collection, validate: Callable[[dict], dict],
+           to_operations: Callable[[list], list], batch_size: int = 1000,
+           after_write: Optional[Callable] = None) -> dict:
+    """
+    레코드를 batch_size 단위로 검증해 ordered=False bulk_write로 저장
+
+    Returns:
+        Dict: 처리 행 수, 저장 수, 거부 행 수와 사유(최대 MAX_REPORTED_ERRORS개), 후처리 실패 배치 수, 초당 처리 행 수
+    """
+    start_time = time.perf_counter()
+    rows = 0
+    written = 0
+    rejected = 0
+    errors = []
+    after_write_failures = 0
+
+    def reject(line_num, reason):
+        nonlocal rejected
+        rejected += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({"line": line_num, "reason": reason})
+
+    def flush(batch):
+        nonlocal written, after_write_failures
+        docs = [doc for _, doc in batch]
+        failed = set()
+        try:
+            result = collection.bulk_write(to_operations(docs), ordered=False)
+            written += result.inserted_count + result.upserted_count + result.modified_count
+        except BulkWriteError as e:
+            details = e.details
+            written += details.get("nInserted", 0) + details.get("nUpserted", 0) + details.get("nModified", 0)
+            for write_error in details.get("writeErrors", []):
+                failed.add(write_error["index"])
+                reject(batch[write_error["index"]][0], write_error.get("errmsg", "저장 실패"))
+
+        if after_write:
+            # 후처리(집계 갱신) 실패는 이미 저장된 데이터에 영향이 없으므로 기록만 하고 계속 진행
+            try:
+                after_write(collection, [doc for i, doc in enumerate(docs) if i not in failed])
+            except Exception as e:
+                after_write_failures += 1
+                logger.warning(f"저장 후처리 실패 ({batch[0][0]}행부터 {len(batch)}행): {e}")
+
+    batch = []
+    for line_num, record in records:
+        rows += 1
+        if isinstance(record, Exception):
+            reject(line_num, str(record))
+            continue
+        if not isinstance(record, dict):
+            reject(line_num, "레코드가 객체 형식이 아닙니다")
+            continue
+        try:
+            batch.append((line_num, validate(record)))
+        except ValueError as e:
+            reject(line_num, str(e))
+            continue
+
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+    elapsed = time.perf_counter() - start_time
+    report = {
+        "rows": rows,
+        "written": written,
+        "rejected": rejected,
+        "errors": errors,
+        "after_write_failures": after_write_failures,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed, 1) if elapsed > 0 else None,
+    }
+    logger.info(f"일괄 적재 완료: {rows}행 처리, {written}건 저장, {rejected}행 거부, {report['rows_per_second']}행/초")
+    return report
+
+
+def ingest_stream(stream: Iterable[str], kind: str, fmt: str, db, batch_size: int = 1000) -> dict:
+    if kind not in KINDS:
+        raise ValueError(f"지원하지 않는 데이터 종류입니다: {kind}")
+    collection_name, validate, to_operations, after_write = KINDS[kind]
+    return ingest(iter_records(stream, fmt), db[collection_name], validate, to_operations, batch_size, after_write)
+
+
+def main():
+    from pymongo import MongoClient
+    from app.config import settings
+
+    parser = argparse.ArgumentParser(description="관측 명소/관측 데이터 일괄 적재")
+    parser.add_argument("kind", choices=sorted(KINDS))
+    parser.add_argument("path", help="CSV 또는 NDJSON 파일 경로")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="생략 시 확장자로 판단")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    client = MongoClient(settings.MONGO_URI)
+    try:
+        with open(args.path, encoding="utf-8-sig", newline="") as stream:
+            report = ingest_stream(stream, args.kind, fmt, client[settings.MONGO_DB_NAME], args.batch_size)
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
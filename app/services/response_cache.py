@@ -0,0 +1,116 @@
+from app.config import settings
+from collections import OrderedDict
+from dataclasses import dataclass
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from typing import Any, Callable, Mapping, Optional
+import hashlib
+import json
+import threading
+import time
+
+
+@dataclass
+class CachedResponse:
+    """직렬화된 응답 본문과 ETag"""
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+class ResponseCache:
+    """
+    TTL과 최대 항목 수로 제한되는 프로세스 내 응답 캐시
+
+    오래된 항목은 조회 시점에 만료 처리되고, 용량을 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다.
+    """
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, payload: Any) -> CachedResponse:
+        body = json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        entry = CachedResponse(
+            body=body,
+            etag=f'"{hashlib.sha1(body).hexdigest()}"',
+            expires_at=time.monotonic() + self.ttl,
+        )
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return entry
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, prefix: Optional[str] = None):
+        """prefix가 주어지면 해당 접두어의 키만, 아니면 전체 캐시를 비웁니다."""
+        with self._lock:
+            if prefix is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def make_cache_key(namespace: str, params: Mapping[str, Any]) -> str:
+    """None 값을 제외하고 이름순으로 정렬한 쿼리 파라미터로 캐시 키를 만듭니다."""
+    normalized = "&".join(f"{name}={params[name]}" for name in sorted(params) if params[name] is not None)
+    return f"{namespace}?{normalized}"
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+def cached_json_response(
+    request: Request,
+    cache: ResponseCache,
+    key: str,
+    build: Callable[[], Any],
+    max_age: int,
+) -> Response:
+    """
+    캐시된 응답을 반환하거나, 없으면 build()로 생성해 캐시에 저장합니다.
+
+    클라이언트의 If-None-Match가 현재 ETag와 같으면 본문 없이 304를 반환합니다.
+    """
+    entry = cache.get(key)
+    if entry is None:
+        entry = cache.set(key, build())
+
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": f"public, max-age={max_age}",
+    }
+    if _etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+# 관측 명소 조회 응답 캐시 (명소 데이터 변경 시 spots_cache.invalidate() 호출)
+spots_cache = ResponseCache(ttl=settings.SPOTS_CACHE_TTL, max_entries=settings.SPOTS_CACHE_MAX_ENTRIES)
@@ -0,0 +1,147 @@
+from app.config import settings
+from datetime import datetime
+from pymongo import ASCENDING, UpdateOne
+from typing import List, Optional
+import argparse
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_COLLECTION = "observation_rollups"
+PERIODS = ("day", "month")
+
+
+def region_cell(latitude: float, longitude: float) -> str:
+    """위경도를 ROLLUP_CELL_DEGREES 크기의 격자 셀 ID로 변환 (예: "375:1269")"""
+    size = settings.ROLLUP_CELL_DEGREES
+    return f"{math.floor(latitude / size)}:{math.floor(longitude / size)}"
+
+
+def bucket_start(when: datetime, period: str) -> datetime:
+    if period == "day":
+        return datetime(when.year, when.month, when.day)
+    return datetime(when.year, when.month, 1)
+
+
+def rollup_operations(observation: dict) -> List[UpdateOne]:
+    """
+    관측 데이터 한 건을 일별/월별 집계 문서에 반영하는 upsert 연산
+
+    중복 사진으로 판정된 데이터나 별 개수가 없는 데이터는 집계하지 않습니다.
+    """
+    if observation.get("duplicate_of"):
+        return []
+    analysis = observation.get("image_analysis") or {}
+    star_count = analysis.get("star_count")
+    if star_count is None or observation.get("latitude") is None or observation.get("longitude") is None:
+        return []
+    if not isinstance(observation.get("uploaded_at"), datetime):
+        return []
+
+    cell = region_cell(observation["latitude"], observation["longitude"])
+    category = str(analysis.get("star_category") or "unknown")
+
+    operations = []
+    for period in PERIODS:
+        start = bucket_start(observation["uploaded_at"], period)
+        bucket = start.strftime("%Y-%m-%d" if period == "day" else "%Y-%m")
+        operations.append(UpdateOne(
+            {"_id": f"{period}:{cell}:{bucket}"},
+            {
+                "$setOnInsert": {"period": period, "cell": cell, "bucket": bucket, "bucket_start": start},
+                "$inc": {"count": 1, "sum_star_count": star_count, f"categories.{category}": 1},
+                "$min": {"min_star_count": star_count},
+                "$max": {"max_star_count": star_count},
+            },
+            upsert=True,
+        ))
+    return operations
+
+
+def record_observations(db, observations: List[dict]):
+    """새로 저장된 관측 데이터를 집계 문서에 반영"""
+    operations = [op for observation in observations for op in rollup_operations(observation)]
+    if operations:
+        db[ROLLUP_COLLECTION].bulk_write(operations, ordered=False)
+
+
+def ensure_rollup_indexes(db):
+    db[ROLLUP_COLLECTION].create_index([("cell", ASCENDING), ("period", ASCENDING), ("bucket_start", ASCENDING)])
+
+
+def get_trend(db, latitude: float, longitude: float, period: str,
+              start: Optional[datetime] = None, end: Optional[datetime] = None) -> dict:
+    """위치가 속한 격자 셀의 기간별 별 개수 추이"""
+    cell = region_cell(latitude, longitude)
+    query = {"cell": cell, "period": period}
+    if start is not None or end is not None:
+        query["bucket_start"] = {}
+        if start is not None:
+            query["bucket_start"]["$gte"] = bucket_start(start, period)
+        if end is not None:
+            query["bucket_start"]["$lte"] = end
+
+    series = []
+    for doc in db[ROLLUP_COLLECTION].find(query).sort("bucket_start", 1):
+        series.append({
+            "bucket": doc["bucket"],
+            "count": doc["count"],
+            "avg_star_count": round(doc["sum_star_count"] / doc["count"], 1) if doc["count"] else None,
+            "min_star_count": doc.get("min_star_count"),
+            "max_star_count": doc.get("max_star_count"),
+            "categories": doc.get("categories", {}),
+        })
+
+    size = settings.ROLLUP_CELL_DEGREES
+    lat_idx, lon_idx = (int(v) for v in cell.split(":"))
+    return {
+        "cell": cell,
+        "bounds": {
+            "min_lat": round(lat_idx * size, 6),
+            "max_lat": round((lat_idx + 1) * size, 6),
+            "min_lon": round(lon_idx * size, 6),
+            "max_lon": round((lon_idx + 1) * size, 6),
+        },
+        "period": period,
+        "series": series,
+    }
+
+
+def rebuild_rollups(db, batch_size: int = 1000) -> int:
+    """기존 관측 데이터 전체로 집계 문서를 다시 만듭니다."""
+    db[ROLLUP_COLLECTION].delete_many({})
+    processed = 0
+    batch = []
+    projection = {"image_analysis": 1, "latitude": 1, "longitude": 1, "uploaded_at": 1, "duplicate_of": 1}
+    for doc in db["observations"].find({}, projection).batch_size(batch_size):
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            record_observations(db, batch)
+            processed += len(batch)
+            batch = []
+    if batch:
+        record_observations(db, batch)
+        processed += len(batch)
+    logger.info(f"관측 집계 재생성 완료: {processed}건")
+    return processed
+
+
+def main():
+    from pymongo import MongoClient
+
+    parser = argparse.ArgumentParser(description="관측 데이터 일별/월별 집계 재생성")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    client = MongoClient(settings.MONGO_URI)
+    try:
+        db = client[settings.MONGO_DB_NAME]
+        ensure_rollup_indexes(db)
+        print(f"{rebuild_rollups(db, args.batch_size)}건 집계 완료")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
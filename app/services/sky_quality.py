@@ -0,0 +1,172 @@
+from pymongo import UpdateOne
+from typing import Dict, Optional
+import numpy as np
+import argparse
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# README의 다변량 천문학적 지표 모델 가중치
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "bortle_scale": 0.35,
+    "sqm": 0.25,
+    "brightness": 0.15,
+    "artificial_brightness": 0.10,
+    "ratio": 0.05,
+    "elevation": 0.10,
+}
+
+# (하한 점수, 카테고리) - 점수가 높은 순
+CATEGORIES = [
+    (80, "최상급"),
+    (60, "좋음"),
+    (40, "보통"),
+    (0, "나쁨"),
+]
+
+SKY_QUALITY_FIELDS = list(DEFAULT_WEIGHTS)
+
+
+def component_scores(metrics: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    각 지표를 0~100점으로 정규화
+
+    Args:
+        metrics: 지표 이름별 float 배열 (값이 없으면 NaN)
+
+    Returns:
+        Dict: 지표 이름별 0~100점 배열 (입력이 NaN이면 NaN)
+    """
+    components = {
+        "bortle_scale": (9 - metrics["bortle_scale"]) / 8 * 100,
+        "sqm": (metrics["sqm"] - 16) / 6 * 100,
+        "brightness": (5 - metrics["brightness"]) / 5 * 100,
+        "artificial_brightness": (5 - metrics["artificial_brightness"]) / 5 * 100,
+        "ratio": (10 - metrics["ratio"]) / 10 * 100,
+        "elevation": metrics["elevation"] / 2000 * 100,
+    }
+    return {name: np.clip(values, 0, 100) for name, values in components.items()}
+
+
+def compute_scores(metrics: Dict[str, np.ndarray], weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """
+    여러 명소의 별 관측 품질 점수를 한 번에 계산
+
+    값이 없는 지표는 제외하고, 남은 지표의 가중치 합으로 다시 정규화합니다.
+    """
+    weights = weights or DEFAULT_WEIGHTS
+    components = component_scores(metrics)
+
+    weighted_sum = np.zeros_like(components["bortle_scale"])
+    weight_total = np.zeros_like(weighted_sum)
+    for name, weight in weights.items():
+        values = components[name]
+        present = ~np.isnan(values)
+        weighted_sum += np.where(present, values * weight, 0)
+        weight_total += np.where(present, weight, 0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scores = weighted_sum / weight_total
+    return np.round(scores, 1)
+
+
+def categorize(scores: np.ndarray) -> np.ndarray:
+    """점수 배열을 카테고리 배열로 변환 (점수가 NaN이면 None)"""
+    conditions = [scores >= threshold for threshold, _ in CATEGORIES]
+    labels = np.select(conditions, [label for _, label in CATEGORIES], default="")
+    return np.where(np.isnan(scores), None, labels)
+
+
+def _metrics_from_docs(docs) -> Dict[str, np.ndarray]:
+    def value(doc, field):
+        v = doc.get("sky_quality", {}).get(field)
+        return np.nan if v is None else v
+
+    return {
+        field: np.array([value(doc, field) for doc in docs], dtype=np.float64)
+        for field in SKY_QUALITY_FIELDS
+    }
+
+
+def recompute_spot_scores(collection, weights: Optional[Dict[str, float]] = None,
+                          batch_size: int = 1000, dry_run: bool = False) -> dict:
+    """
+    모든 관측 명소의 점수와 카테고리를 다시 계산해 저장
+
+    명소를 batch_size 단위로 읽어 배치별로 벡터 연산하고, 변경된 문서만 bulk_write로 갱신합니다.
+    """
+    start_time = time.perf_counter()
+    projection = {f"sky_quality.{field}": 1 for field in SKY_QUALITY_FIELDS}
+    projection.update({"sky_quality.score": 1, "sky_quality.category": 1})
+    cursor = collection.find({"sky_quality": {"$exists": True}}, projection).batch_size(batch_size)
+
+    processed = 0
+    modified = 0
+    batch = []
+
+    def flush(docs):
+        nonlocal modified
+        scores = compute_scores(_metrics_from_docs(docs), weights)
+        categories = categorize(scores)
+
+        operations = []
+        for doc, score, category in zip(docs, scores, categories):
+            if np.isnan(score):
+                continue
+            sky_quality = doc.get("sky_quality", {})
+            score, category = float(score), str(category)
+            if sky_quality.get("score") == score and sky_quality.get("category") == category:
+                continue
+            operations.append(UpdateOne(
+                {"_id": doc["_id"]},
+                {"$set": {"sky_quality.score": score, "sky_quality.category": category}},
+            ))
+
+        if operations and not dry_run:
+            modified += collection.bulk_write(operations, ordered=False).modified_count
+        elif dry_run:
+            modified += len(operations)
+
+    for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            flush(batch)
+            processed += len(batch)
+            batch = []
+    if batch:
+        flush(batch)
+        processed += len(batch)
+
+    elapsed = time.perf_counter() - start_time
+    logger.info(f"명소 점수 재계산 완료: {processed}개 처리, {modified}개 변경, {elapsed:.2f}초")
+    return {"processed": processed, "modified": modified, "elapsed_seconds": round(elapsed, 3)}
+
+
+def main():
+    from pymongo import MongoClient
+    from app.config import settings
+
+    parser = argparse.ArgumentParser(description="관측 명소 별 관측 품질 점수 재계산")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="저장하지 않고 변경될 문서 수만 출력")
+    for field, weight in DEFAULT_WEIGHTS.items():
+        parser.add_argument(f"--weight-{field.replace('_', '-')}", dest=field, type=float, default=weight)
+    args = parser.parse_args()
+
+    weights = {field: getattr(args, field) for field in DEFAULT_WEIGHTS}
+    client = MongoClient(settings.MONGO_URI)
+    try:
+        result = recompute_spot_scores(
+            client[settings.MONGO_DB_NAME]["observation_spots"],
+            weights=weights,
+            batch_size=args.batch_size,
+            dry_run=args.dry_run,
+        )
+        print(result)
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+from app.config import settings
+from app.services.spot_search import SEARCH_FIELDS_PROJECTION
+from datetime import datetime
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Optional
+import numpy as np
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = np.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """기준점에서 여러 지점까지의 Haversine 거리(km)를 한 번에 계산"""
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class _Snapshot:
+    """한 번 로드된 명소 데이터 (위도 오름차순 정렬)"""
+    def __init__(self, spots: List[dict]):
+        spots = sorted(spots, key=lambda s: s["location"]["latitude"])
+        self.spots = spots
+        self.lats = np.array([s["location"]["latitude"] for s in spots], dtype=np.float64)
+        self.lons = np.array([s["location"]["longitude"] for s in spots], dtype=np.float64)
+        self.scores = np.array([s["sky_quality"]["score"] for s in spots], dtype=np.float64)
+        # 값이 없으면 NaN으로 두어 MongoDB의 $lte 조회처럼 Bortle 조건에서 항상 제외되게 함
+        self.bortle = np.array([s["sky_quality"].get("bortle_scale", np.nan) for s in spots], dtype=np.float64)
+        self.categories = np.array([s["sky_quality"].get("category") for s in spots], dtype=object)
+        self.loaded_at = time.monotonic()
+
+
+class SpotIndex:
+    """
+    관측 명소 전체를 메모리에 올려두고 주변/상위 명소 조회를 처리하는 인덱스
+
+    좌표와 점수를 NumPy 배열로 보관하고, 위도로 정렬된 배열에서 이진 탐색으로
+    검색 반경에 해당하는 위도 구간만 잘라낸 뒤 벡터화된 Haversine으로 거리를 계산합니다.
+    refresh_interval이 지나거나 invalidate()가 호출되면 다음 조회 시 컬렉션에서 다시 로드합니다.
+    다시 로드는 _lock으로 한 번에 하나만 실행되며, async 핸들러에서는 refresh()로 스레드풀에서 실행합니다.
+    """
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._snapshot: Optional[_Snapshot] = None
+        self._stale = True
+        self._lock = threading.Lock()
+
+    def load(self, collection):
+        """컬렉션의 모든 명소를 읽어 인덱스를 새로 구성"""
+        with self._lock:
+            self._load(collection)
+
+    def _load(self, collection):
+        # 읽는 도중 invalidate()가 호출되면 다음 조회에서 다시 로드되도록 먼저 표시를 지움
+        self._stale = False
+        try:
+            snapshot = self._read_snapshot(collection)
+        except Exception:
+            self._stale = True
+            raise
+        self._snapshot = snapshot
+        logger.info(f"관측 명소 인덱스 로드 완료: {len(snapshot.spots)}개")
+
+    def _read_snapshot(self, collection) -> _Snapshot:
+        spots = []
+        for doc in collection.find(
+            {"location": {"$exists": True}, "sky_quality.score": {"$exists": True}},
+            SEARCH_FIELDS_PROJECTION,
+        ):
+            doc["_id"] = str(doc["_id"])
+            if "created_at" in doc and isinstance(doc["created_at"], datetime):
+                doc["created_at"] = doc["created_at"].isoformat()
+            spots.append(doc)
+        return _Snapshot(spots)
+
+    def invalidate(self):
+        self._stale = True
+
+    def needs_reload(self) -> bool:
+        snapshot = self._snapshot
+        expired = snapshot is None or time.monotonic() - snapshot.loaded_at > self.refresh_interval
+        return self._stale or expired
+
+    def ensure_fresh(self, collection) -> _Snapshot:
+        if self.needs_reload():
+            with self._lock:
+                # 락을 기다리는 동안 다른 요청이 이미 다시 로드했으면 건너뜀
+                if self.needs_reload():
+                    self._load(collection)
+        return self._snapshot
+
+    async def refresh(self, collection):
+        """이벤트 루프를 막지 않도록 필요할 때만 스레드풀에서 다시 로드"""
+        if self.needs_reload():
+            await run_in_threadpool(self.ensure_fresh, collection)
+
+    def nearby(self, collection, lat: float, lon: float, radius: float, limit: int,
+               min_score: Optional[float] = None) -> List[dict]:
+        """반경(km) 내 명소를 거리순으로 반환"""
+        snap = self.ensure_fresh(collection)
+
+        # 위도 구간으로 후보 축소 (위도 1도 ≈ 111km)
+        lat_delta = radius / KM_PER_DEGREE_LAT
+        lo = np.searchsorted(snap.lats, lat - lat_delta, side="left")
+        hi = np.searchsorted(snap.lats, lat + lat_delta, side="right")
+        if lo >= hi:
+            return []
+
+        distances = haversine_km(lat, lon, snap.lats[lo:hi], snap.lons[lo:hi])
+        mask = distances <= radius
+        if min_score is not None:
+            mask &= snap.scores[lo:hi] >= min_score
+
+        candidates = np.flatnonzero(mask)
+        order = candidates[np.argsort(distances[candidates], kind="stable")][:limit]
+
+        results = []
+        for i in order:
+            spot = dict(snap.spots[lo + i])
+            spot["distance"] = round(float(distances[i]), 2)
+            results.append(spot)
+        return results
+
+    def best(self, collection, limit: int, bortle_max: Optional[int] = None,
+             category: Optional[str] = None) -> List[dict]:
+        """조건을 만족하는 명소를 점수 내림차순으로 상위 limit개 반환"""
+        snap = self.ensure_fresh(collection)
+
+        mask = np.ones(len(snap.spots), dtype=bool)
+        if bortle_max is not None:
+            mask &= snap.bortle <= bortle_max
+        if category:
+            mask &= snap.categories == category
+
+        candidates = np.flatnonzero(mask)
+        order = candidates[np.argsort(-snap.scores[candidates], kind="stable")][:limit]
+        return [dict(snap.spots[i]) for i in order]
+
+
+spot_index = SpotIndex(refresh_interval=settings.SPOT_INDEX_REFRESH_SECONDS)
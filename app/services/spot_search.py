@@ -0,0 +1,90 @@
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from typing import List
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+MAX_PREFIX_LENGTH = 20
+
+# 응답에서 제외할 내부 검색 필드
+SEARCH_FIELDS_PROJECTION = {"name_ngrams": 0, "name_prefixes": 0}
+
+
+def normalize_name(name: str) -> str:
+    """검색용 이름 정규화: 소문자 변환 + 연속 공백 정리"""
+    return " ".join(name.lower().split())
+
+
+def name_ngrams(text: str) -> List[str]:
+    """
+    한글 지명 검색을 위한 1~2글자 n-gram 목록
+
+    형태소 분석 없이도 부분 문자열 검색이 가능하도록 단어별 글자 단위 n-gram을 만듭니다.
+    """
+    grams = set()
+    for token in normalize_name(text).split():
+        grams.update(token)
+        grams.update(token[i:i + 2] for i in range(len(token) - 1))
+    return sorted(grams)
+
+
+def name_prefixes(name: str) -> List[str]:
+    """자동완성용 접두어 목록 (전체 이름과 각 단어의 접두어)"""
+    normalized = normalize_name(name)
+    prefixes = set()
+    for word in [normalized, normalized.replace(" ", "")] + normalized.split():
+        prefixes.update(word[:i] for i in range(1, min(len(word), MAX_PREFIX_LENGTH) + 1))
+    return sorted(prefixes)
+
+
+def search_fields(name: str) -> dict:
+    """명소 문서에 저장할 검색 필드"""
+    return {
+        "name_ngrams": name_ngrams(name),
+        "name_prefixes": name_prefixes(name),
+    }
+
+
+def build_search_query(search: str) -> dict:
+    """
+    이름 부분 검색 조건
+
+    n-gram 인덱스로 후보를 좁히고, 이스케이프한 정규식으로 실제 부분 문자열 일치 여부를 확인합니다.
+    """
+    query = {"name": {"$regex": re.escape(search.strip()), "$options": "i"}}
+    grams = name_ngrams(search)
+    if grams:
+        query["name_ngrams"] = {"$all": grams}
+    return query
+
+
+def build_autocomplete_query(prefix: str) -> dict:
+    normalized = normalize_name(prefix)[:MAX_PREFIX_LENGTH]
+    return {"name_prefixes": normalized}
+
+
+def ensure_search_indexes(collection):
+    collection.create_index([("name_ngrams", ASCENDING)])
+    collection.create_index([("name_prefixes", ASCENDING), ("sky_quality.score", DESCENDING)])
+
+
+def backfill_search_fields(collection, batch_size: int = 500) -> int:
+    """검색 필드가 없는 명소 문서에 n-gram/접두어 필드를 채워 넣습니다."""
+    updated = 0
+    operations = []
+    cursor = collection.find(
+        {"name": {"$type": "string"}, "name_ngrams": {"$exists": False}},
+        {"name": 1},
+    ).batch_size(batch_size)
+    for doc in cursor:
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": search_fields(doc["name"])}))
+        if len(operations) >= batch_size:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        updated += collection.bulk_write(operations, ordered=False).modified_count
+
+    if updated:
+        logger.info(f"명소 검색 필드 갱신: {updated}개")
+    return updated
@@ -1,20 +1,67 @@
 from app.config import settings
+from app.services.cpu_budget import cpu_budget
+from app.services.star_detectors import add_detector_engine
+from app.services.upload_validation import UnreadableImageError
 from datetime import datetime
 from fastapi import logger
+from typing import Optional
 import numpy as np
 import logging
+import threading
+import time
 import cv2
 import os
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+PREFILTER_MAX_DIMENSION = 256
+NOT_NIGHT_SKY_MESSAGE = "이 이미지는 밤하늘이 아니거나 구름이 많아 별을 관측하기 어려운 조건입니다."
+
+# peaks 엔진 파라미터 (PEAK_DETECTOR_MAX_DIMENSION으로 축소한 이미지 기준 픽셀)
+PEAK_BACKGROUND_KERNEL = 31
+PEAK_NMS_KERNEL = 5
+PEAK_MAX_PLATEAU_AREA = 25
+
 class StarCounter:
     """밤하늘 사진에서 별의 개수를 세는 OpenCV 기반 알고리즘"""
     def __init__(self):
-        cv2.setNumThreads(16)
+        cv2.setNumThreads(cpu_budget.opencv_threads)
         self.debug_dir = os.path.join(settings.UPLOAD_DIR, "debug")
-        os.makedirs(self.debug_dir, exist_ok=True)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "analyzed": 0,
+            "prefilter_rejected": 0,
+            "prefilter_seconds": 0.0,
+            "pipeline_seconds": 0.0,
+        }
+        self._engine_stats = {}
+        self.detectors = {}
+        self.register_detector("contour", self.detect_contour)
+        self.register_detector("peaks", self.detect_peaks)
+
+    def sky_brightness(self, img):
+        """
+        사전 필터용 축소 밝기(HSV의 V 채널) 이미지
+
+        V = max(B, G, R)이므로 전체 HSV 변환 없이 채널 최대값으로 바로 구합니다.
+        """
+        height, width = img.shape[:2]
+        scale = PREFILTER_MAX_DIMENSION / max(height, width)
+        if scale < 1:
+            img = cv2.resize(img, (max(1, int(width * scale)), max(1, int(height * scale))), interpolation=cv2.INTER_AREA)
+        return img.max(axis=2) if img.ndim == 3 else img
+
+    def sky_brightness_stats(self, img, dark_level: Optional[int] = None):
+        """
+        축소 이미지에서 밝기 통계 계산
+
+        Returns:
+            Tuple: (평균 밝기, 어두운 픽셀(V < dark_level, 기본값 NIGHT_SKY_DARK_LEVEL) 비율)
+        """
+        dark_level = settings.NIGHT_SKY_DARK_LEVEL if dark_level is None else dark_level
+        value = self.sky_brightness(img)
+        return float(value.mean()), float(np.count_nonzero(value < dark_level) / value.size)
 
     def is_night_sky(self, img):
         """
@@ -26,17 +73,40 @@ class StarCounter:
         Returns:
             bool: 밤하늘 여부
         """
-        hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
-        avg_brightness = np.mean(hsv[:,:,2])
-        
-        dark_pixels = np.sum(hsv[:,:,2] < 50) / (img.shape[0] * img.shape[1])
-        
-        blue_mask = cv2.inRange(hsv, (100, 0, 0), (140, 255, 100))
-        blue_pixels = np.sum(blue_mask > 0) / (img.shape[0] * img.shape[1])
-        
-        is_night = (avg_brightness < 100 and dark_pixels > 0.6)
+        avg_brightness, dark_ratio = self.sky_brightness_stats(img)
+        return avg_brightness < settings.NIGHT_SKY_MAX_BRIGHTNESS and dark_ratio > settings.NIGHT_SKY_MIN_DARK_RATIO
 
-        return is_night
+    def _record(self, **increments):
+        with self._stats_lock:
+            for key, value in increments.items():
+                self._stats[key] += value
+
+    def _record_engine(self, engine: str, seconds: float):
+        with self._stats_lock:
+            stats = self._engine_stats.setdefault(engine, {"runs": 0, "seconds": 0.0})
+            stats["runs"] += 1
+            stats["seconds"] += seconds
+
+    def prefilter_stats(self) -> dict:
+        """밤하늘 사전 필터 통계 (전체 파이프라인 평균 시간으로 절약 시간 추정)"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+            engines = {
+                name: {**s, "avg_seconds": round(s["seconds"] / s["runs"], 4) if s["runs"] else 0.0}
+                for name, s in self._engine_stats.items()
+            }
+        full_runs = stats["analyzed"] - stats["prefilter_rejected"]
+        avg_pipeline = stats["pipeline_seconds"] / full_runs if full_runs else 0.0
+        avg_prefilter = stats["prefilter_seconds"] / stats["analyzed"] if stats["analyzed"] else 0.0
+        return {
+            **stats,
+            "enabled": settings.NIGHT_SKY_PREFILTER_ENABLED,
+            "avg_pipeline_seconds": round(avg_pipeline, 4),
+            "avg_prefilter_seconds": round(avg_prefilter, 6),
+            "estimated_seconds_saved": round(stats["prefilter_rejected"] * (avg_pipeline - avg_prefilter), 2),
+            "default_engine": settings.STAR_DETECTOR_ENGINE,
+            "engines": engines,
+        }
 
     def filter_light_sources(self, img, stars):
         """
@@ -82,23 +152,145 @@ class StarCounter:
         
         return filtered_stars
 
-    def count_stars(self, image_path: str, debug: bool = False):
+    def register_detector(self, name: str, detector):
+        """
+        별 검출 엔진 등록
+
+        Args:
+            name: 엔진 이름 (count_stars의 engine 인자, STAR_DETECTOR_ENGINE 설정 값)
+            detector: BGR 이미지를 받아 별 좌표 [(x, y), ...]를 반환하는 함수
+        """
+        self.detectors[name] = detector
+        add_detector_engine(name)
+
+    def resolve_engine(self, engine: Optional[str] = None) -> str:
+        """요청한 엔진 이름 확인 (None이면 STAR_DETECTOR_ENGINE 설정 사용)"""
+        engine = engine or settings.STAR_DETECTOR_ENGINE
+        if engine not in self.detectors:
+            raise ValueError(f"지원하지 않는 별 검출 엔진입니다: {engine} (사용 가능: {', '.join(self.detectors)})")
+        return engine
+
+    def detect_stars(self, img, engine: Optional[str] = None):
+        """
+        선택한 엔진으로 별 좌표 검출
+
+        Returns:
+            Tuple: (엔진 이름, 별 좌표 리스트)
+        """
+        engine = self.resolve_engine(engine)
+        return engine, self.detectors[engine](img)
+
+    def detect_contour(self, img):
+        """
+        기본 엔진: CLAHE → 가우시안 블러 → 적응형 임계값 → 모폴로지 → 윤곽선 → 광원 필터
+        """
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        
+        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        enhanced = clahe.apply(gray)
+        
+        blurred = cv2.GaussianBlur(enhanced, (5, 5), 0)
+
+        thresh = cv2.adaptiveThreshold(
+            blurred,
+            255,
+            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+            cv2.THRESH_BINARY,
+            13,  
+            -3  
+        )
+
+        _, bright_stars = cv2.threshold(blurred, 210, 255, cv2.THRESH_BINARY)
+        combined = cv2.bitwise_or(thresh, bright_stars)
+
+        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        opening = cv2.morphologyEx(combined, cv2.MORPH_OPEN, kernel)
+
+        contours, _ = cv2.findContours(
+            opening,
+            cv2.RETR_EXTERNAL,
+            cv2.CHAIN_APPROX_SIMPLE
+        )
+
+        min_area = 4       
+        max_area = 100     
+        min_circularity = 0.5 
+
+        stars = []
+        for contour in contours:
+            area = cv2.contourArea(contour)
+
+            if min_area <= area <= max_area:
+                perimeter = cv2.arcLength(contour, True)
+                if perimeter == 0:
+                    continue
+                
+                circularity = 4 * np.pi * area / (perimeter * perimeter)
+
+                if circularity >= min_circularity:
+                    M = cv2.moments(contour)
+                    if M["m00"] == 0:
+                        continue
+
+                    cx = int(M["m10"] / M["m00"])
+                    cy = int(M["m01"] / M["m00"])
+
+                    stars.append((cx, cy))
+
+        # 별이 아닌 광원 필터링
+        return self.filter_light_sources(img, stars)
+
+    def detect_peaks(self, img):
+        """
+        빠른 엔진: 축소한 흑백 이미지에서 배경을 빼고 dilate 기반 극대점(NMS)으로 별 검출
+
+        - 박스 블러로 추정한 배경을 빼서 광해/비네팅 같은 완만한 밝기 변화를 제거
+        - 잔차의 MAD로 잡음 수준을 추정해 PEAK_DETECTOR_SIGMA 배 이상 밝은 극대점만 별로 인정
+        - 포화된 평탄 영역은 연결 요소 하나로 합치고, 너무 넓은 영역(가로등, 달 등)은 제외
+        """
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        height, width = gray.shape
+        scale = min(1.0, settings.PEAK_DETECTOR_MAX_DIMENSION / max(height, width))
+        if scale < 1:
+            gray = cv2.resize(gray, (max(1, int(width * scale)), max(1, int(height * scale))), interpolation=cv2.INTER_AREA)
+
+        gray = gray.astype(np.float32)
+        background = cv2.blur(gray, (PEAK_BACKGROUND_KERNEL, PEAK_BACKGROUND_KERNEL))
+        residual = cv2.GaussianBlur(gray - background, (3, 3), 0)
+
+        sample = residual[::4, ::4]
+        noise = 1.4826 * float(np.median(np.abs(sample - np.median(sample))))
+        threshold = max(settings.PEAK_DETECTOR_SIGMA * noise, settings.PEAK_DETECTOR_MIN_CONTRAST)
+
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (PEAK_NMS_KERNEL, PEAK_NMS_KERNEL))
+        peaks = ((residual >= cv2.dilate(residual, kernel)) & (residual > threshold)).astype(np.uint8)
+
+        count, _, component_stats, centroids = cv2.connectedComponentsWithStats(peaks, connectivity=8)
+        areas = component_stats[1:, cv2.CC_STAT_AREA]
+        centroids = centroids[1:][areas <= PEAK_MAX_PLATEAU_AREA] / scale
+        return [(int(x), int(y)) for x, y in centroids]
+
+    def count_stars(self, image_path: str, debug: bool = False, engine: Optional[str] = None):
         """
         밤하늘 사진에서 별 개수를 세는 함수
 
         Args:
             image_path: 이미지 파일 경로
             debug: 디버그 모드 활성화 여부
+            engine: 별 검출 엔진 ("contour", "peaks"), None이면 STAR_DETECTOR_ENGINE 설정 사용
 
         Returns:
             Dict: 별 개수 및 관련 정보 
         """
         try:
             start_time = datetime.now()
+            engine = self.resolve_engine(engine)
 
             original_img = cv2.imread(image_path)
             if original_img is None:
-                raise FileNotFoundError(f"이미지를 찾을 수 없습니다: {image_path}")
+                if not os.path.exists(image_path):
+                    raise FileNotFoundError(f"이미지를 찾을 수 없습니다: {image_path}")
+                raise UnreadableImageError(f"이미지를 디코딩할 수 없습니다: {image_path}")
 
             height, width = original_img.shape[:2]
             max_dimension = 1920  
@@ -109,71 +301,28 @@ class StarCounter:
                 new_height = int(height * scale)
                 original_img = cv2.resize(original_img, (new_width, new_height))
 
-            # # 밤하늘 감지 필터 적용
-            # if not self.is_night_sky(original_img):
-            #     return {
-            #         "star_count": 0,
-            #         "star_category": "1",  # 가장 낮은 등급
-            #         "ui_message": "이 이미지는 밤하늘이 아니거나 구름이 많아 별을 관측하기 어려운 조건입니다."
-            #     }
-
-            gray = cv2.cvtColor(original_img, cv2.COLOR_BGR2GRAY)
-            
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-            enhanced = clahe.apply(gray)
-            
-            blurred = cv2.GaussianBlur(enhanced, (5, 5), 0)
-
-            thresh = cv2.adaptiveThreshold(
-                blurred,
-                255,
-                cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                cv2.THRESH_BINARY,
-                13,  
-                -3  
-            )
-
-            _, bright_stars = cv2.threshold(blurred, 210, 255, cv2.THRESH_BINARY)
-            combined = cv2.bitwise_or(thresh, bright_stars)
-
-            kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
-            opening = cv2.morphologyEx(combined, cv2.MORPH_OPEN, kernel)
-
-            contours, _ = cv2.findContours(
-                opening,
-                cv2.RETR_EXTERNAL,
-                cv2.CHAIN_APPROX_SIMPLE
-            )
-
-            min_area = 4       
-            max_area = 100     
-            min_circularity = 0.5 
-
-            stars = []
-            for contour in contours:
-                area = cv2.contourArea(contour)
-
-                if min_area <= area <= max_area:
-                    perimeter = cv2.arcLength(contour, True)
-                    if perimeter == 0:
-                        continue
-                    
-                    circularity = 4 * np.pi * area / (perimeter * perimeter)
-
-                    if circularity >= min_circularity:
-                        M = cv2.moments(contour)
-                        if M["m00"] == 0:
-                            continue
-
-                        cx = int(M["m10"] / M["m00"])
-                        cy = int(M["m01"] / M["m00"])
-
-                        stars.append((cx, cy))
+            # 밤하늘 감지 필터 적용 (낮 사진, 스크린샷, 흐린 하늘은 이후 단계를 건너뜀)
+            if settings.NIGHT_SKY_PREFILTER_ENABLED:
+                prefilter_start = time.perf_counter()
+                is_night = self.is_night_sky(original_img)
+                prefilter_seconds = time.perf_counter() - prefilter_start
+                if not is_night:
+                    self._record(analyzed=1, prefilter_rejected=1, prefilter_seconds=prefilter_seconds)
+                    logger.info(f"밤하늘 사전 필터로 분석 생략: {image_path}")
+                    return {
+                        "star_count": 0,
+                        "star_category": "1",  # 가장 낮은 등급
+                        "ui_message": NOT_NIGHT_SKY_MESSAGE,
+                        "engine": engine
+                    }
+            else:
+                prefilter_seconds = 0.0
 
-            # 별이 아닌 광원 필터링
-            filtered_stars = self.filter_light_sources(original_img, stars)
+            engine, filtered_stars = self.detect_stars(original_img, engine)
             
             processing_time = (datetime.now() - start_time).total_seconds()
+            self._record(analyzed=1, prefilter_seconds=prefilter_seconds, pipeline_seconds=processing_time)
+            self._record_engine(engine, processing_time)
             star_count = len(filtered_stars)
             
             if debug:
@@ -181,19 +330,21 @@ class StarCounter:
                 for x, y in filtered_stars:
                     cv2.circle(debug_img, (x, y), 5, (0, 255, 0), 1)
                 
-                debug_path = os.path.join(self.debug_dir, f"debug_{os.path.basename(image_path)}")
+                os.makedirs(self.debug_dir, exist_ok=True)
+                debug_path = os.path.join(self.debug_dir, f"debug_{engine}_{os.path.basename(image_path)}")
                 cv2.imwrite(debug_path, debug_img)
                 logger.info(f"디버그 이미지 저장됨: {debug_path}")
 
             star_category = self.determine_star_count_category(star_count)
             ui_message = self.get_star_count_message(star_count, star_category)
 
-            logger.info(f"별 카운팅 완료: {star_count}개 감지, 카테고리: {star_category}, 처리 시간: {processing_time:.2f}초")
+            logger.info(f"별 카운팅 완료: {star_count}개 감지, 카테고리: {star_category}, 엔진: {engine}, 처리 시간: {processing_time:.2f}초")
 
             return {
                 "star_count": star_count,
                 "star_category": star_category,
-                "ui_message": ui_message
+                "ui_message": ui_message,
+                "engine": engine
             }
 
         except FileNotFoundError as e:
@@ -203,7 +354,8 @@ class StarCounter:
             logger.error(f"별 카운팅 에러: {str(e)}")
             raise
     
-    def determine_star_count_category(self, star_count: int) -> str:
+    @staticmethod
+    def determine_star_count_category(star_count: int) -> str:
         """별 개수에 따른 관측 카테고리 결정"""
         if star_count >= 300:
             return "4" 
@@ -214,7 +366,8 @@ class StarCounter:
         else:
             return "1" 
     
-    def get_star_count_message(self, star_count: int, category: str) -> str:
+    @staticmethod
+    def get_star_count_message(star_count: int, category: str) -> str:
         """사용자에게 표시할 별 카운팅 결과 메시지 생성"""
         if category == "4":
             return f"오늘 {star_count}개의 별이 관측되었어요. 은하수도 선명하게 관측할 수 있는 최상의 조건이에요."
@@ -228,4 +381,171 @@ class StarCounter:
             else:
                 return f"오늘 {star_count}개의 별이 관측되었어요. 도시 불빛으로 인해 별이 잘 보이지 않는 조건이에요."
 
-star_counter = StarCounter()
\ No newline at end of file
+_star_counter = None
+_star_counter_lock = threading.Lock()
+
+def get_star_counter() -> StarCounter:
+    """처음 호출될 때 StarCounter를 생성해 재사용"""
+    global _star_counter
+    if _star_counter is None:
+        with _star_counter_lock:
+            if _star_counter is None:
+                _star_counter = StarCounter()
+    return _star_counter
+
+
+def calibrate_prefilter(night_images, other_images):
+    """
+    밤하늘/비밤하늘 예시 이미지로 사전 필터 임계값 조합별 정확도 계산
+
+    밤하늘 사진을 잘못 거르면 별 개수가 0으로 저장되므로, 밤하늘 통과율(night_pass)을 먼저 보고
+    그 다음 비밤하늘 제거율(other_reject)이 높은 조합을 고르면 됩니다.
+    밤하늘 예시에는 광해가 심한 도심 사진을 꼭 포함해야 합니다.
+    """
+    counter = get_star_counter()
+
+    def load_histograms(paths):
+        histograms = []
+        for path in paths:
+            img = cv2.imread(path, cv2.IMREAD_REDUCED_COLOR_2)
+            if img is None:
+                logger.warning(f"이미지를 읽을 수 없습니다: {path}")
+                continue
+            value = counter.sky_brightness(img)
+            histograms.append(np.bincount(value.ravel(), minlength=256) / value.size)
+        return np.array(histograms, dtype=np.float64).reshape(-1, 256)
+
+    night, other = load_histograms(night_images), load_histograms(other_images)
+    levels = np.arange(256)
+    # 밝기 기준값별 어두운 픽셀 비율: dark[:, L] = V < L 인 픽셀 비율
+    night_mean, other_mean = night @ levels, other @ levels
+    night_dark = np.concatenate([np.zeros((len(night), 1)), np.cumsum(night, axis=1)], axis=1)
+    other_dark = np.concatenate([np.zeros((len(other), 1)), np.cumsum(other, axis=1)], axis=1)
+
+    results = []
+    for max_brightness in range(40, 201, 10):
+        for dark_level in range(50, 201, 10):
+            for min_dark_ratio in np.arange(0.3, 0.91, 0.05):
+                night_pass = (night_mean < max_brightness) & (night_dark[:, dark_level] > min_dark_ratio)
+                other_pass = (other_mean < max_brightness) & (other_dark[:, dark_level] > min_dark_ratio)
+                results.append({
+                    "max_brightness": max_brightness,
+                    "dark_level": dark_level,
+                    "min_dark_ratio": round(float(min_dark_ratio), 2),
+                    "night_pass": round(float(night_pass.mean()), 3) if len(night) else None,
+                    "other_reject": round(float(1 - other_pass.mean()), 3) if len(other) else None,
+                })
+    results.sort(key=lambda r: (r["night_pass"] or 0, r["other_reject"] or 0), reverse=True)
+    return results
+
+
+def compare_engines(image_paths, engines=None, baseline: str = "contour", repeat: int = 1):
+    """
+    같은 이미지에서 엔진별 별 개수와 검출 시간 비교
+
+    디코딩/리사이즈는 한 번만 하고 검출 단계만 측정합니다. 사전 필터는 적용하지 않습니다.
+
+    Returns:
+        Tuple: (이미지별 결과 리스트, 엔진별 요약 - baseline 대비 개수 차이/카테고리 일치율/속도 배율)
+    """
+    counter = get_star_counter()
+    engines = list(engines or counter.detectors)
+    if baseline not in engines:
+        engines.insert(0, baseline)
+
+    rows = []
+    for path in image_paths:
+        img = cv2.imread(path)
+        if img is None:
+            logger.warning(f"이미지를 읽을 수 없습니다: {path}")
+            continue
+        height, width = img.shape[:2]
+        if max(height, width) > 1920:
+            scale = 1920 / max(height, width)
+            img = cv2.resize(img, (int(width * scale), int(height * scale)))
+
+        row = {"path": path, "counts": {}, "seconds": {}}
+        for engine in engines:
+            best = None
+            for _ in range(max(1, repeat)):
+                start = time.perf_counter()
+                _, stars = counter.detect_stars(img, engine)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            row["counts"][engine] = len(stars)
+            row["seconds"][engine] = best
+        rows.append(row)
+
+    summary = {}
+    if not rows:
+        return rows, summary
+    base_counts = np.array([r["counts"][baseline] for r in rows], dtype=np.float64)
+    base_seconds = np.array([r["seconds"][baseline] for r in rows])
+    base_categories = [StarCounter.determine_star_count_category(int(c)) for c in base_counts]
+    for engine in engines:
+        counts = np.array([r["counts"][engine] for r in rows], dtype=np.float64)
+        seconds = np.array([r["seconds"][engine] for r in rows])
+        categories = [StarCounter.determine_star_count_category(int(c)) for c in counts]
+        correlation = None
+        if len(rows) > 1 and counts.std() > 0 and base_counts.std() > 0:
+            correlation = round(float(np.corrcoef(counts, base_counts)[0, 1]), 3)
+        summary[engine] = {
+            "avg_seconds": round(float(seconds.mean()), 4),
+            "speedup": round(float(base_seconds.sum() / seconds.sum()), 2) if seconds.sum() else None,
+            "mean_abs_diff": round(float(np.abs(counts - base_counts).mean()), 1),
+            "mean_rel_diff": round(float((np.abs(counts - base_counts) / np.maximum(base_counts, 1)).mean()), 3),
+            "category_agreement": round(sum(a == b for a, b in zip(categories, base_categories)) / len(rows), 3),
+            "correlation": correlation,
+        }
+    return rows, summary
+
+
+def main():
+    import argparse
+    import glob
+
+    parser = argparse.ArgumentParser(description="별 카운터 사전 필터 검증 및 검출 엔진 비교")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    calibrate = subparsers.add_parser("calibrate", help="밤하늘 사전 필터 임계값 검증")
+    calibrate.add_argument("--night", required=True, help="밤하늘 예시 이미지 디렉터리")
+    calibrate.add_argument("--other", required=True, help="낮 사진/스크린샷/흐린 하늘 예시 이미지 디렉터리")
+    calibrate.add_argument("--top", type=int, default=10)
+
+    compare = subparsers.add_parser("compare", help="같은 이미지로 검출 엔진별 정확도/속도 비교")
+    compare.add_argument("images", nargs="+", help="비교할 이미지 파일 또는 디렉터리")
+    compare.add_argument("--engines", default=None, help="비교할 엔진 목록 (예: contour,peaks)")
+    compare.add_argument("--baseline", default="contour", help="기준 엔진")
+    compare.add_argument("--repeat", type=int, default=3, help="이미지별 반복 측정 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+
+    def images_in(directory):
+        return sorted(p for ext in ("jpg", "jpeg", "png") for p in glob.glob(os.path.join(directory, f"*.{ext}")))
+
+    if args.command == "calibrate":
+        print(f"현재 설정: max_brightness={settings.NIGHT_SKY_MAX_BRIGHTNESS}, dark_level={settings.NIGHT_SKY_DARK_LEVEL}, "
+              f"min_dark_ratio={settings.NIGHT_SKY_MIN_DARK_RATIO}")
+        print(f"{'brightness':>10} {'dark_level':>10} {'dark_ratio':>10} {'night_pass':>10} {'other_reject':>12}")
+        for r in calibrate_prefilter(images_in(args.night), images_in(args.other))[:args.top]:
+            print(f"{r['max_brightness']:>10} {r['dark_level']:>10} {r['min_dark_ratio']:>10} "
+                  f"{r['night_pass']!s:>10} {r['other_reject']!s:>12}")
+        return
+
+    paths = [p for arg in args.images for p in (images_in(arg) if os.path.isdir(arg) else [arg])]
+    engines = args.engines.split(",") if args.engines else None
+    rows, summary = compare_engines(paths, engines, args.baseline, args.repeat)
+    names = list(summary)
+
+    print(f"{'image':<40} " + " ".join(f"{name:>16}" for name in names))
+    for row in rows:
+        cells = " ".join(f"{row['counts'][name]:>7} {row['seconds'][name] * 1000:>6.1f}ms" for name in names)
+        print(f"{os.path.basename(row['path'])[:40]:<40} {cells}")
+    print()
+    print(f"{'engine':>10} {'avg_ms':>8} {'speedup':>8} {'abs_diff':>9} {'rel_diff':>9} {'category':>9} {'corr':>6}")
+    for name, s in summary.items():
+        print(f"{name:>10} {s['avg_seconds'] * 1000:>8.1f} {s['speedup']!s:>8} {s['mean_abs_diff']:>9} "
+              f"{s['mean_rel_diff']:>9} {s['category_agreement']:>9} {s['correlation']!s:>6}")
+
+
+if __name__ == "__main__":
+    main()
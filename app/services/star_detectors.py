@@ -0,0 +1,19 @@
+from app.config import settings
+from typing import Optional
+
+# 등록된 별 검출 엔진 이름 (OpenCV를 로드하지 않고 요청/설정의 엔진 이름을 확인하기 위해 StarCounter와 분리)
+# 기본 엔진 외에는 StarCounter.register_detector로 등록할 때 추가됨
+DETECTOR_ENGINES = {"contour", "peaks"}
+
+
+def add_detector_engine(name: str):
+    """엔진 이름 등록 (StarCounter.register_detector에서 호출)"""
+    DETECTOR_ENGINES.add(name)
+
+
+def resolve_engine_name(engine: Optional[str] = None) -> str:
+    """요청한 엔진 이름 확인 (None이면 STAR_DETECTOR_ENGINE 설정 사용)"""
+    engine = engine or settings.STAR_DETECTOR_ENGINE
+    if engine not in DETECTOR_ENGINES:
+        raise ValueError(f"지원하지 않는 별 검출 엔진입니다: {engine} (사용 가능: {', '.join(sorted(DETECTOR_ENGINES))})")
+    return engine
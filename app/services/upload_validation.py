@@ -0,0 +1,192 @@
+from fastapi import HTTPException, UploadFile
+from app.config import settings
+from typing import Optional, Tuple
+import os
+import struct
+
+CHUNK_SIZE = 64 * 1024
+# JPEG은 EXIF/ICC 세그먼트 뒤에 SOF가 오므로 넉넉하게 헤더를 모아서 확인
+PROBE_LIMIT = 512 * 1024
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+JPEG_SIGNATURE = b"\xff\xd8\xff"
+JPEG_EOI = b"\xff\xd9"
+# 크기 정보를 담은 JPEG SOF 마커 (DHT/JPG/DAC 제외)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+FORMAT_EXTENSIONS = {"jpeg": {"jpg", "jpeg"}, "png": {"png"}}
+UNREADABLE_IMAGE_DETAIL = "손상되었거나 일부만 업로드된 이미지 파일입니다."
+
+
+class UnreadableImageError(ValueError):
+    """헤더 검사는 통과했지만 디코딩할 수 없는 이미지 (헤더 뒤가 잘린 파일 등)"""
+
+
+def check_extension(filename: Optional[str]) -> str:
+    """허용된 확장자인지 확인하고 확장자(점 포함)를 반환"""
+    file_extension = os.path.splitext(filename or "")[1]
+    if file_extension.lower().lstrip(".") not in settings.ALLOWED_EXTENSIONS:
+        raise HTTPException(status_code=400, detail="지원되지 않는 파일 형식입니다. JPG 또는 PNG 이미지만 업로드 가능합니다.")
+    return file_extension
+
+
+def sniff_format(head: bytes) -> Optional[str]:
+    """파일 앞부분의 매직 바이트로 이미지 형식 판별"""
+    if head.startswith(PNG_SIGNATURE):
+        return "png"
+    if head.startswith(JPEG_SIGNATURE):
+        return "jpeg"
+    return None
+
+
+def _png_dimensions(head: bytes) -> Optional[Tuple[int, int]]:
+    if len(head) < 24:
+        return None
+    if head[12:16] != b"IHDR":
+        raise ValueError("PNG IHDR 청크가 없습니다")
+    width, height = struct.unpack(">II", head[16:24])
+    return width, height
+
+
+def _find_jpeg_sof(head: bytes) -> Optional[int]:
+    """JPEG 세그먼트를 건너뛰며 크기 정보를 담은 SOF 마커의 위치를 찾음 (데이터가 부족하면 None)"""
+    pos = 2
+    while True:
+        if pos + 4 > len(head):
+            return None
+        if head[pos] != 0xFF:
+            raise ValueError("JPEG 마커 구조가 올바르지 않습니다")
+        marker = head[pos + 1]
+        if marker == 0xFF:
+            pos += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            pos += 2
+            continue
+        if marker in (0xD9, 0xDA):
+            raise ValueError("JPEG 크기 정보(SOF)가 없습니다")
+
+        length = struct.unpack(">H", head[pos + 2:pos + 4])[0]
+        if length < 2:
+            raise ValueError("JPEG 세그먼트 길이가 올바르지 않습니다")
+        if marker in JPEG_SOF_MARKERS:
+            if pos + 9 > len(head):
+                return None
+            return pos
+        pos += 2 + length
+
+
+def _jpeg_dimensions(head: bytes) -> Optional[Tuple[int, int]]:
+    pos = _find_jpeg_sof(head)
+    if pos is None:
+        return None
+    height, width = struct.unpack(">HH", head[pos + 5:pos + 9])
+    return width, height
+
+
+def _jpeg_after_sof(head: bytes) -> bytes:
+    """SOF 세그먼트 뒤의 데이터 (EXIF 썸네일의 EOI와 구분하기 위해 여기서부터 EOI 마커를 찾음)"""
+    pos = _find_jpeg_sof(head)
+    length = struct.unpack(">H", head[pos + 2:pos + 4])[0]
+    return head[pos + 2 + length:]
+
+
+def probe_dimensions(fmt: str, head: bytes) -> Optional[Tuple[int, int]]:
+    """
+    디코딩 없이 헤더만으로 이미지 크기 (width, height) 확인
+
+    Returns:
+        Tuple: (width, height), 헤더가 아직 다 들어오지 않았으면 None
+    """
+    if fmt == "png":
+        return _png_dimensions(head)
+    return _jpeg_dimensions(head)
+
+
+def _check_dimensions(width: int, height: int):
+    if width < settings.MIN_IMAGE_DIMENSION or height < settings.MIN_IMAGE_DIMENSION:
+        raise HTTPException(status_code=400, detail=f"이미지가 너무 작습니다 ({width}x{height})")
+    if width * height > settings.MAX_IMAGE_PIXELS:
+        raise HTTPException(status_code=413, detail=f"이미지 해상도가 너무 큽니다 ({width}x{height})")
+
+
+async def save_validated_upload(image: UploadFile, file_path: str) -> dict:
+    """
+    업로드 파일을 청크 단위로 읽으며 검증 후 저장
+
+    - 읽은 바이트가 MAX_UPLOAD_SIZE를 넘는 즉시 413으로 거부
+    - 매직 바이트와 헤더의 이미지 크기를 확인하기 전에는 디스크에 쓰지 않음
+    - JPEG은 SOF 뒤에 EOI 마커(FF D9)가 없으면 잘린 파일로 보고 거부 (EOI 뒤의 추가 데이터는 허용)
+    - 거부되면 일부 저장된 파일을 삭제
+
+    Returns:
+        Dict: 형식, 가로/세로 크기, 파일 크기
+    """
+    extension = os.path.splitext(file_path)[1].lower().lstrip(".")
+    head = b""
+    fmt = None
+    dimensions = None
+    size = 0
+    buffer = None
+    has_eoi = False
+    eoi_tail = b""
+
+    try:
+        while True:
+            chunk = await image.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > settings.MAX_UPLOAD_SIZE:
+                raise HTTPException(status_code=413, detail=f"파일 크기가 너무 큽니다. 최대 {settings.MAX_UPLOAD_SIZE // (1024 * 1024)}MB까지 업로드 가능합니다.")
+
+            if buffer is not None:
+                buffer.write(chunk)
+                if fmt == "jpeg" and not has_eoi:
+                    # 청크 경계에 걸친 마커도 찾도록 이전 청크의 마지막 바이트를 이어 붙여 확인
+                    has_eoi = JPEG_EOI in eoi_tail + chunk
+                    eoi_tail = chunk[-1:]
+                continue
+
+            head += chunk
+            fmt = fmt or sniff_format(head[:8])
+            if len(head) >= 8 and (fmt is None or extension not in FORMAT_EXTENSIONS[fmt]):
+                raise HTTPException(status_code=400, detail="이미지 파일이 아니거나 확장자와 실제 형식이 일치하지 않습니다.")
+            if fmt is None:
+                continue
+
+            try:
+                dimensions = probe_dimensions(fmt, head)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"손상된 이미지 파일입니다: {e}")
+            if dimensions is None:
+                if len(head) > PROBE_LIMIT:
+                    raise HTTPException(status_code=400, detail="이미지 크기 정보를 확인할 수 없습니다.")
+                continue
+
+            _check_dimensions(*dimensions)
+            buffer = open(file_path, "wb")
+            buffer.write(head)
+            if fmt == "jpeg":
+                after_sof = _jpeg_after_sof(head)
+                has_eoi = JPEG_EOI in after_sof
+                eoi_tail = after_sof[-1:]
+            head = b""
+
+        if buffer is None:
+            # 파일 끝까지 읽었지만 형식/크기 확인에 실패
+            raise HTTPException(status_code=400, detail="이미지 파일이 아니거나 손상된 파일입니다.")
+        if fmt == "jpeg" and not has_eoi:
+            raise HTTPException(status_code=400, detail=UNREADABLE_IMAGE_DETAIL)
+    except BaseException:
+        if buffer is not None:
+            buffer.close()
+            buffer = None
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        raise
+    finally:
+        if buffer is not None:
+            buffer.close()
+
+    width, height = dimensions
+    return {"format": fmt, "width": width, "height": height, "size": size}
@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# app.config는 배포 환경의 .env 값을 필수로 읽으므로 테스트용 기본값 지정
+os.environ.setdefault("MONGO_DB_NAME", "test")
+os.environ.setdefault("UPLOAD_DIR", tempfile.mkdtemp(prefix="uploads-"))
+os.environ.setdefault("SECRET_KEY", "test")
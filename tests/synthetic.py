@@ -0,0 +1,37 @@
+"""테스트용 합성 밤하늘 이미지 생성"""
+import cv2
+import numpy as np
+
+
+def star_field(seed: int, width: int = 1600, height: int = 1200, background: float = 20,
+               gradient: float = 40, stars: int = 150, noise: float = 3.0) -> np.ndarray:
+    """
+    하늘 배경 + 세로 방향 광해 그라데이션 + 가우시안 잡음 위에 점광원 별을 찍은 BGR 이미지
+
+    Args:
+        seed: 별 위치/밝기와 잡음을 결정하는 난수 시드
+        background: 하늘 배경 밝기 (0~255)
+        gradient: 이미지 아래쪽으로 갈수록 더해지는 밝기 (광해)
+        stars: 별 개수
+    """
+    rng = np.random.default_rng(seed)
+    sky = background + gradient * np.linspace(0, 1, height)[:, None] + rng.normal(0, noise, (height, width))
+
+    radius = 6
+    yy, xx = np.mgrid[-radius:radius + 1, -radius:radius + 1]
+    psf = np.exp(-(xx ** 2 + yy ** 2) / (2 * 1.5 ** 2))
+    xs = rng.integers(radius, width - radius, stars)
+    ys = rng.integers(radius, height - radius, stars)
+    for x, y, amplitude in zip(xs, ys, rng.uniform(40, 200, stars)):
+        sky[y - radius:y + radius + 1, x - radius:x + radius + 1] += amplitude * psf
+
+    gray = np.clip(sky, 0, 255).astype(np.uint8)
+    return cv2.merge([gray, gray, gray])
+
+
+def save_resized_jpeg(img: np.ndarray, path, scale: float = 0.5, quality: int = 60) -> str:
+    """같은 사진을 다시 올리는 경우처럼 축소 후 JPEG로 재압축해 저장"""
+    height, width = img.shape[:2]
+    resized = cv2.resize(img, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+    cv2.imwrite(str(path), resized, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return str(path)
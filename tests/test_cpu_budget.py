@@ -0,0 +1,49 @@
+import pytest
+
+from app.config import settings
+from app.services import cpu_budget
+from app.services.cpu_budget import cgroup_cpu_limit, resolve_cpu_budget
+
+
+@pytest.fixture(autouse=True)
+def auto_settings(monkeypatch):
+    for name in ("CPU_LIMIT", "WEB_CONCURRENCY", "ANALYSIS_CONCURRENCY", "OPENCV_THREADS"):
+        monkeypatch.setattr(settings, name, 0)
+
+
+@pytest.mark.parametrize("cpus, workers, expected", [
+    (1, 1, (1, 1)),
+    (2, 1, (1, 2)),
+    (8, 1, (2, 4)),
+    (8, 2, (2, 2)),
+    (8, 4, (1, 2)),
+    (4, 8, (1, 1)),
+])
+def test_cores_are_split_between_workers_analyses_and_opencv_threads(cpus, workers, expected):
+    budget = resolve_cpu_budget(cpus=cpus, workers=workers)
+
+    assert (budget.analysis_concurrency, budget.opencv_threads) == expected
+    assert budget.workers * budget.analysis_concurrency * budget.opencv_threads <= max(cpus, workers)
+
+
+def test_settings_override_automatic_values(monkeypatch):
+    monkeypatch.setattr(settings, "CPU_LIMIT", 16)
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 2)
+    monkeypatch.setattr(settings, "OPENCV_THREADS", 3)
+
+    budget = resolve_cpu_budget()
+
+    assert (budget.cpus, budget.workers, budget.analysis_concurrency, budget.opencv_threads) == (16, 2, 2, 3)
+
+
+@pytest.mark.parametrize("files, expected", [
+    ({"/sys/fs/cgroup/cpu.max": "150000 100000"}, 1.5),
+    ({"/sys/fs/cgroup/cpu.max": "max 100000"}, None),
+    ({"/sys/fs/cgroup/cpu/cpu.cfs_quota_us": "200000", "/sys/fs/cgroup/cpu/cpu.cfs_period_us": "100000"}, 2.0),
+    ({"/sys/fs/cgroup/cpu/cpu.cfs_quota_us": "-1", "/sys/fs/cgroup/cpu/cpu.cfs_period_us": "100000"}, None),
+    ({}, None),
+])
+def test_cgroup_cpu_limit_reads_v2_then_v1(monkeypatch, files, expected):
+    monkeypatch.setattr(cpu_budget, "_read", files.get)
+
+    assert cgroup_cpu_limit() == expected
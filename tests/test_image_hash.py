@@ -0,0 +1,42 @@
+import itertools
+
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from app.config import settings
+from app.services.image_hash import compute_star_hash, hamming_distance, hash_bands
+from synthetic import save_resized_jpeg, star_field
+
+
+def _save_png(img, path):
+    cv2.imwrite(str(path), img)
+    return str(path)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_resized_and_recompressed_photo_is_near_duplicate(tmp_path, seed):
+    img = star_field(seed)
+    original = compute_star_hash(_save_png(img, tmp_path / "original.png"))
+    resized = compute_star_hash(save_resized_jpeg(img, tmp_path / "resized.jpg", scale=0.5, quality=60))
+
+    assert hamming_distance(original, resized) <= settings.DUPLICATE_HASH_DISTANCE
+
+
+def test_different_star_fields_with_same_sky_glow_are_not_duplicates(tmp_path):
+    hashes = [compute_star_hash(_save_png(star_field(seed), tmp_path / f"{seed}.png")) for seed in range(8)]
+
+    for a, b in itertools.combinations(hashes, 2):
+        assert hamming_distance(a, b) > settings.DUPLICATE_HASH_DISTANCE * 2
+
+
+def test_starless_frame_has_no_hash(tmp_path):
+    assert compute_star_hash(_save_png(star_field(0, stars=0), tmp_path / "empty.png")) is None
+
+
+def test_near_duplicates_share_a_band(tmp_path):
+    img = star_field(1)
+    original = compute_star_hash(_save_png(img, tmp_path / "original.png"))
+    resized = compute_star_hash(save_resized_jpeg(img, tmp_path / "resized.jpg"))
+
+    assert set(hash_bands(original)) & set(hash_bands(resized))
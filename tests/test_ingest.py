@@ -0,0 +1,99 @@
+import io
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.services.ingest import _spot_operations, ingest, iter_records, validate_observation, validate_spot
+
+
+def test_validate_spot_reads_flat_csv_row():
+    doc = validate_spot({"name": " 별마로 천문대 ", "latitude": "37.19", "longitude": "128.48", "bortle_scale": "3", "sqm": ""})
+
+    assert doc["name"] == "별마로 천문대"
+    assert list(doc["location"]) == ["longitude", "latitude"]
+    assert doc["location"] == {"longitude": 128.48, "latitude": 37.19}
+    assert doc["sky_quality"] == {"bortle_scale": 3.0}
+    assert "별마" in doc["name_ngrams"] and "별마로" in doc["name_prefixes"]
+
+
+def test_validate_spot_reads_nested_ndjson_record():
+    doc = validate_spot({
+        "name": "안반데기",
+        "location": {"latitude": 37.62, "longitude": 128.74},
+        "sky_quality": {"score": 88, "category": "최상급"},
+    })
+
+    assert doc["sky_quality"] == {"score": 88.0, "category": "최상급"}
+
+
+@pytest.mark.parametrize("record, message", [
+    ({"latitude": 37, "longitude": 127, "bortle_scale": 3}, "name"),
+    ({"name": "a", "latitude": 91, "longitude": 127, "bortle_scale": 3}, "latitude"),
+    ({"name": "a", "latitude": 37, "longitude": 127, "bortle_scale": 12}, "bortle_scale"),
+    ({"name": "a", "latitude": 37, "longitude": 127, "sqm": "dark"}, "sqm"),
+    ({"name": "a", "latitude": 37, "longitude": 127}, "sky_quality"),
+])
+def test_validate_spot_rejects_invalid_records(record, message):
+    with pytest.raises(ValueError, match=message):
+        validate_spot(record)
+
+
+def test_spot_operations_fill_missing_score_and_category():
+    docs = [
+        validate_spot({"name": "a", "latitude": 37, "longitude": 127, "bortle_scale": 1}),
+        validate_spot({"name": "b", "latitude": 37, "longitude": 127, "score": 65}),
+    ]
+    _spot_operations(docs)
+
+    assert docs[0]["sky_quality"]["score"] == 100
+    assert docs[0]["sky_quality"]["category"] == "최상급"
+    assert docs[1]["sky_quality"]["category"] == "좋음"
+
+
+def test_validate_observation_derives_category_and_manual_count():
+    pytest.importorskip("cv2")
+    doc = validate_observation({
+        "latitude": "37.5", "longitude": "127.0", "star_count": "85",
+        "uploaded_at": "2025-04-01T21:30:00", "manual_star_count_range": "5~8",
+    })
+
+    assert doc["image_analysis"]["star_count"] == 85
+    assert doc["image_analysis"]["star_category"] == "3"
+    assert doc["user_input"]["manual_star_count"] == 6
+    assert doc["uploaded_at"] == datetime(2025, 4, 1, 21, 30)
+
+
+def test_validate_observation_rejects_bad_timestamp():
+    pytest.importorskip("cv2")
+    with pytest.raises(ValueError, match="uploaded_at"):
+        validate_observation({"latitude": 37, "longitude": 127, "star_count": 3, "uploaded_at": "yesterday"})
+
+
+class FakeCollection:
+    def __init__(self):
+        self.batches = []
+
+    def bulk_write(self, operations, ordered):
+        self.batches.append(operations)
+        return SimpleNamespace(inserted_count=0, upserted_count=len(operations), modified_count=0)
+
+
+def test_ingest_reports_rejected_lines_and_writes_in_batches():
+    stream = io.StringIO(
+        '{"name": "a", "latitude": 37, "longitude": 127, "score": 50}\n'
+        "{not json}\n"
+        '{"name": "b", "latitude": 37, "longitude": 127}\n'
+        '{"name": "c", "latitude": 37, "longitude": 127, "score": 70}\n'
+        '{"name": "d", "latitude": 37, "longitude": 127, "score": 90}\n'
+    )
+    collection = FakeCollection()
+
+    report = ingest(iter_records(stream, "ndjson"), collection, validate_spot, _spot_operations, batch_size=2)
+
+    assert report["rows"] == 5
+    assert report["written"] == 3
+    assert [e["line"] for e in report["errors"]] == [2, 3]
+    assert [len(batch) for batch in collection.batches] == [2, 1]
@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app, MULTIPART_OVERHEAD
+
+BOUNDARY = "upload-boundary"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+@pytest.fixture(autouse=True)
+def small_upload_limit(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_SIZE", 1024)
+
+
+def test_upload_with_large_content_length_is_rejected():
+    # lifespan(DB 연결)은 실행하지 않음
+    response = TestClient(app).post(
+        f"{settings.API_V1_STR}/upload",
+        content=b"\x00" * (1024 + MULTIPART_OVERHEAD + 1),
+        headers={"Content-Type": CONTENT_TYPE},
+    )
+
+    assert response.status_code == 413
+    assert "message" in response.json()
+
+
+def test_chunked_upload_is_rejected_once_body_passes_the_limit():
+    piece = b"\x00" * (16 * 1024)
+    messages = [(
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="image"; filename="sky.jpg"\r\n'
+        "Content-Type: image/jpeg\r\n\r\n"
+    ).encode()] + [piece] * 64
+    pulled = 0
+    sent = []
+
+    async def receive():
+        nonlocal pulled
+        pulled += 1
+        return {"type": "http.request", "body": messages[pulled - 1], "more_body": pulled < len(messages)}
+
+    async def send(message):
+        sent.append(message)
+
+    # Content-Length 없이(chunked 전송) 본문을 나눠 보냄
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": f"{settings.API_V1_STR}/analyze-image",
+        "headers": [(b"content-type", CONTENT_TYPE.encode())],
+        "query_string": b"",
+        "app": app,
+    }
+    asyncio.run(app(scope, receive, send))
+
+    assert sent[0]["type"] == "http.response.start"
+    assert sent[0]["status"] == 413
+    assert "message" in json.loads(sent[1]["body"])
+    assert pulled * len(piece) <= 1024 + MULTIPART_OVERHEAD + 2 * len(piece)
+    assert pulled < len(messages)
@@ -0,0 +1,71 @@
+from starlette.requests import Request
+
+from app.services import response_cache
+from app.services.response_cache import ResponseCache, cached_json_response, make_cache_key
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers, "query_string": b""})
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+    cache = ResponseCache(ttl=60, max_entries=10)
+
+    cache.set("a", {"value": 1})
+    now[0] += 59
+    assert cache.get("a") is not None
+    now[0] += 2
+    assert cache.get("a") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(ttl=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+
+def test_invalidate_by_prefix():
+    cache = ResponseCache(ttl=60, max_entries=10)
+    cache.set("best?limit=5", 1)
+    cache.set("nearby?lat=1", 2)
+
+    cache.invalidate("best")
+    assert cache.get("best?limit=5") is None
+    assert cache.get("nearby?lat=1") is not None
+
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_cache_key_ignores_order_and_none_values():
+    assert make_cache_key("best", {"limit": 5, "category": None, "bortle_max": 4}) == "best?bortle_max=4&limit=5"
+    assert make_cache_key("best", {"bortle_max": 4, "limit": 5}) == make_cache_key("best", {"limit": 5, "bortle_max": 4})
+
+
+def test_cached_response_builds_once_and_answers_304_for_matching_etag():
+    cache = ResponseCache(ttl=60, max_entries=10)
+    calls = []
+
+    def build():
+        calls.append(1)
+        return {"spots": ["별마로 천문대"]}
+
+    first = cached_json_response(_request(), cache, "k", build, max_age=30)
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "public, max-age=30"
+
+    etag = first.headers["etag"]
+    second = cached_json_response(_request(etag), cache, "k", build, max_age=30)
+    assert second.status_code == 304
+    assert second.body == b""
+    assert cached_json_response(_request(f'W/{etag}, "other"'), cache, "k", build, max_age=30).status_code == 304
+    assert len(calls) == 1
@@ -0,0 +1,55 @@
+from datetime import datetime
+
+import pytest
+
+from app.config import settings
+from app.services.rollups import bucket_start, region_cell, rollup_operations
+
+
+@pytest.fixture(autouse=True)
+def cell_size(monkeypatch):
+    monkeypatch.setattr(settings, "ROLLUP_CELL_DEGREES", 0.1)
+
+
+def _observation(**overrides):
+    observation = {
+        "latitude": 37.5665,
+        "longitude": 126.978,
+        "uploaded_at": datetime(2025, 4, 1, 21, 30),
+        "image_analysis": {"star_count": 42, "star_category": "2"},
+    }
+    observation.update(overrides)
+    return observation
+
+
+def test_region_cell_floors_to_grid():
+    assert region_cell(37.5665, 126.978) == "375:1269"
+    assert region_cell(-33.86, 151.21) == "-339:1512"
+
+
+def test_bucket_start_truncates_to_day_and_month():
+    when = datetime(2025, 4, 17, 23, 59)
+    assert bucket_start(when, "day") == datetime(2025, 4, 17)
+    assert bucket_start(when, "month") == datetime(2025, 4, 1)
+
+
+def test_observation_updates_day_and_month_buckets():
+    operations = rollup_operations(_observation())
+
+    assert [op._filter for op in operations] == [{"_id": "day:375:1269:2025-04-01"}, {"_id": "month:375:1269:2025-04"}]
+    update = operations[0]._doc
+    assert update["$inc"] == {"count": 1, "sum_star_count": 42, "categories.2": 1}
+    assert update["$min"] == {"min_star_count": 42}
+    assert update["$max"] == {"max_star_count": 42}
+    assert update["$setOnInsert"]["bucket_start"] == datetime(2025, 4, 1)
+    assert all(op._upsert for op in operations)
+
+
+@pytest.mark.parametrize("overrides", [
+    {"duplicate_of": "abc"},
+    {"image_analysis": {}},
+    {"latitude": None},
+    {"uploaded_at": "2025-04-01"},
+])
+def test_duplicates_and_incomplete_observations_are_skipped(overrides):
+    assert rollup_operations(_observation(**overrides)) == []
@@ -0,0 +1,53 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.services.sky_quality import SKY_QUALITY_FIELDS, categorize, component_scores, compute_scores
+
+
+def _metrics(**values):
+    """명소 한 곳의 지표 (주어지지 않은 지표는 NaN)"""
+    return {field: np.array([values.get(field, np.nan)], dtype=np.float64) for field in SKY_QUALITY_FIELDS}
+
+
+BEST = dict(bortle_scale=1, sqm=22, brightness=0, artificial_brightness=0, ratio=0, elevation=2000)
+WORST = dict(bortle_scale=9, sqm=16, brightness=5, artificial_brightness=5, ratio=10, elevation=0)
+
+
+def test_best_and_worst_sky_score_100_and_0():
+    assert compute_scores(_metrics(**BEST))[0] == 100
+    assert compute_scores(_metrics(**WORST))[0] == 0
+
+
+def test_components_are_clipped_to_0_100():
+    components = component_scores(_metrics(sqm=30, elevation=-100, bortle_scale=5))
+    assert components["sqm"][0] == 100
+    assert components["elevation"][0] == 0
+    assert components["bortle_scale"][0] == 50
+
+
+def test_weighted_average_of_components():
+    # bortle 5 -> 50점(가중치 0.35), sqm 19 -> 50점(0.25), 나머지 지표는 최상(100점, 가중치 합 0.4)
+    metrics = _metrics(**dict(BEST, bortle_scale=5, sqm=19))
+    assert compute_scores(metrics)[0] == pytest.approx((50 * 0.35 + 50 * 0.25 + 100 * 0.4) / 1.0, abs=0.05)
+
+
+def test_missing_metrics_are_dropped_and_weights_renormalized():
+    # bortle만 있으면 bortle 점수 그대로, bortle+sqm이면 두 가중치(0.35, 0.25)로만 평균
+    assert compute_scores(_metrics(bortle_scale=5))[0] == 50
+    assert compute_scores(_metrics(bortle_scale=1, sqm=16))[0] == pytest.approx(100 * 0.35 / 0.6, abs=0.05)
+
+
+def test_no_metrics_gives_nan_and_no_category():
+    score = compute_scores(_metrics())
+    assert np.isnan(score[0])
+    assert categorize(score)[0] is None
+
+
+def test_scores_are_computed_per_spot_in_one_call():
+    metrics = {field: np.array([BEST[field], WORST[field]], dtype=np.float64) for field in SKY_QUALITY_FIELDS}
+    assert list(compute_scores(metrics)) == [100, 0]
+
+
+def test_category_boundaries():
+    assert list(categorize(np.array([100, 80, 79.9, 60, 40, 39.9, 0]))) == ["최상급", "최상급", "좋음", "좋음", "보통", "나쁨", "나쁨"]
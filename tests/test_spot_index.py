@@ -0,0 +1,76 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.services.spot_index import SpotIndex, haversine_km
+
+
+class FakeCollection:
+    """SpotIndex가 사용하는 find()만 흉내낸 컬렉션"""
+    def __init__(self, docs):
+        self.docs = docs
+        self.finds = 0
+
+    def find(self, query=None, projection=None):
+        self.finds += 1
+        return [dict(doc, sky_quality=dict(doc["sky_quality"])) for doc in self.docs]
+
+
+def _spot(spot_id, lat, lon, score, bortle=None, category=None):
+    sky_quality = {"score": score}
+    if bortle is not None:
+        sky_quality["bortle_scale"] = bortle
+    if category is not None:
+        sky_quality["category"] = category
+    return {"_id": spot_id, "name": spot_id, "location": {"longitude": lon, "latitude": lat}, "sky_quality": sky_quality}
+
+
+SEOUL = (37.5665, 126.9780)
+SPOTS = [
+    _spot("near", 37.60, 126.98, 40, bortle=8, category="보통"),
+    _spot("mid", 37.80, 127.20, 70, bortle=5, category="좋음"),
+    _spot("far", 35.18, 129.08, 95, bortle=2, category="최상"),
+    _spot("unrated", 37.57, 126.97, 85),
+]
+
+
+def test_haversine_km_matches_known_distance():
+    distances = haversine_km(*SEOUL, np.array([SEOUL[0], 35.1796]), np.array([SEOUL[1], 129.0756]))
+
+    assert distances[0] == pytest.approx(0.0, abs=1e-9)
+    assert distances[1] == pytest.approx(325, abs=5)  # 서울-부산
+
+
+def test_nearby_sorts_by_distance_and_applies_radius_and_min_score():
+    index = SpotIndex(refresh_interval=600)
+    collection = FakeCollection(SPOTS)
+
+    names = [s["name"] for s in index.nearby(collection, *SEOUL, radius=50, limit=10)]
+    assert names == ["unrated", "near", "mid"]
+
+    results = index.nearby(collection, *SEOUL, radius=50, limit=10, min_score=60)
+    assert [s["name"] for s in results] == ["unrated", "mid"]
+    assert results[0]["distance"] < results[1]["distance"]
+
+
+def test_best_excludes_spots_without_bortle_like_the_mongodb_query():
+    index = SpotIndex(refresh_interval=600)
+    collection = FakeCollection(SPOTS)
+
+    assert [s["name"] for s in index.best(collection, limit=10, bortle_max=9)] == ["far", "mid", "near"]
+    assert [s["name"] for s in index.best(collection, limit=10)] == ["far", "unrated", "mid", "near"]
+    assert [s["name"] for s in index.best(collection, limit=10, category="좋음")] == ["mid"]
+
+
+def test_reloads_only_after_invalidate():
+    index = SpotIndex(refresh_interval=600)
+    collection = FakeCollection(SPOTS)
+
+    index.best(collection, limit=1)
+    index.best(collection, limit=1)
+    assert collection.finds == 1
+
+    collection.docs = SPOTS[:1]
+    index.invalidate()
+    assert [s["name"] for s in index.best(collection, limit=10)] == ["near"]
+    assert collection.finds == 2
@@ -0,0 +1,48 @@
+import re
+
+from app.services.spot_search import (
+    MAX_PREFIX_LENGTH,
+    build_autocomplete_query,
+    build_search_query,
+    name_ngrams,
+    name_prefixes,
+    normalize_name,
+)
+
+NAME = "별마로 천문대"
+
+
+def test_normalize_name_lowercases_and_collapses_spaces():
+    assert normalize_name("  Byeolmaro   Observatory ") == "byeolmaro observatory"
+
+
+def test_name_ngrams_are_one_and_two_character_grams_per_word():
+    assert name_ngrams(NAME) == sorted({"별", "마", "로", "천", "문", "대", "별마", "마로", "천문", "문대"})
+
+
+def test_every_substring_of_a_word_is_covered_by_the_stored_ngrams():
+    stored = set(name_ngrams(NAME))
+    for word in NAME.split():
+        for i in range(len(word)):
+            for j in range(i + 1, len(word) + 1):
+                assert set(name_ngrams(word[i:j])) <= stored
+
+
+def test_name_prefixes_cover_full_name_joined_name_and_each_word():
+    prefixes = set(name_prefixes(NAME))
+    assert {"별", "별마로", "별마로 천", "별마로천", "천", "천문대"} <= prefixes
+    assert "문대" not in prefixes
+
+
+def test_name_prefixes_are_capped():
+    assert max(len(p) for p in name_prefixes("가" * 40)) == MAX_PREFIX_LENGTH
+
+
+def test_search_query_escapes_regex_and_requires_all_ngrams():
+    query = build_search_query(" 천문(대) ")
+    assert query["name"] == {"$regex": re.escape("천문(대)"), "$options": "i"}
+    assert set(query["name_ngrams"]["$all"]) == set(name_ngrams("천문(대)"))
+
+
+def test_autocomplete_query_matches_normalized_prefix():
+    assert build_autocomplete_query("  별마로  천 ") == {"name_prefixes": "별마로 천"}
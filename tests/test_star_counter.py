@@ -0,0 +1,72 @@
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from app.config import settings
+from app.services import star_detectors
+from app.services.star_counter import NOT_NIGHT_SKY_MESSAGE, StarCounter
+from synthetic import star_field
+
+
+@pytest.fixture
+def prefilter_on(monkeypatch):
+    monkeypatch.setattr(settings, "NIGHT_SKY_PREFILTER_ENABLED", True)
+
+
+def _save(img, tmp_path, name="sky.png"):
+    path = tmp_path / name
+    cv2.imwrite(str(path), img)
+    return str(path)
+
+
+@pytest.mark.parametrize("background, gradient", [(20, 40), (55, 40), (90, 60)])
+def test_light_polluted_night_sky_passes_prefilter(tmp_path, prefilter_on, background, gradient):
+    path = _save(star_field(0, background=background, gradient=gradient, noise=5), tmp_path)
+
+    result = StarCounter().count_stars(path)
+
+    assert result["ui_message"] != NOT_NIGHT_SKY_MESSAGE
+    assert result["star_count"] > 0
+
+
+def test_prefilter_does_not_change_counts_of_night_frames(tmp_path, monkeypatch):
+    path = _save(star_field(1, background=55), tmp_path)
+    counter = StarCounter()
+
+    monkeypatch.setattr(settings, "NIGHT_SKY_PREFILTER_ENABLED", False)
+    without_filter = counter.count_stars(path)["star_count"]
+    monkeypatch.setattr(settings, "NIGHT_SKY_PREFILTER_ENABLED", True)
+    with_filter = counter.count_stars(path)["star_count"]
+
+    assert with_filter == without_filter
+
+
+def test_daylight_frame_is_rejected(tmp_path, prefilter_on):
+    path = _save(star_field(0, background=200, gradient=20, stars=0), tmp_path)
+
+    result = StarCounter().count_stars(path)
+
+    assert result["ui_message"] == NOT_NIGHT_SKY_MESSAGE
+    assert result["star_count"] == 0
+
+
+@pytest.mark.parametrize("engine", ["contour", "peaks"])
+def test_engines_count_synthetic_stars(tmp_path, engine):
+    path = _save(star_field(3, stars=150), tmp_path)
+
+    result = StarCounter().count_stars(path, engine=engine)
+
+    assert result["engine"] == engine
+    assert 120 <= result["star_count"] <= 180
+
+
+def test_registered_detector_is_selectable(tmp_path, monkeypatch):
+    monkeypatch.setattr(star_detectors, "DETECTOR_ENGINES", set(star_detectors.DETECTOR_ENGINES))
+    counter = StarCounter()
+    counter.register_detector("fixed", lambda img: [(1, 1), (2, 2)])
+
+    assert counter.resolve_engine("fixed") == "fixed"
+    assert star_detectors.resolve_engine_name("fixed") == "fixed"
+    assert counter.count_stars(_save(star_field(0), tmp_path), engine="fixed")["star_count"] == 2
+    with pytest.raises(ValueError):
+        counter.resolve_engine("unknown")
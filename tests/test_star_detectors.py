@@ -0,0 +1,33 @@
+import pytest
+
+from app.config import settings
+from app.services import star_detectors
+from app.services.star_detectors import add_detector_engine, resolve_engine_name
+
+
+@pytest.fixture(autouse=True)
+def engines(monkeypatch):
+    monkeypatch.setattr(star_detectors, "DETECTOR_ENGINES", set(star_detectors.DETECTOR_ENGINES))
+
+
+def test_default_engine_comes_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "STAR_DETECTOR_ENGINE", "peaks")
+
+    assert resolve_engine_name() == "peaks"
+    assert resolve_engine_name("contour") == "contour"
+
+
+def test_unknown_engine_is_rejected(monkeypatch):
+    with pytest.raises(ValueError):
+        resolve_engine_name("unknown")
+
+    monkeypatch.setattr(settings, "STAR_DETECTOR_ENGINE", "unknown")
+    with pytest.raises(ValueError):
+        resolve_engine_name()
+
+
+def test_added_engine_is_accepted():
+    add_detector_engine("custom")
+
+    assert resolve_engine_name("custom") == "custom"
+
@@ -0,0 +1,93 @@
+import asyncio
+import io
+import struct
+import zlib
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.services.upload_validation import (
+    CHUNK_SIZE,
+    UnreadableImageError,
+    probe_dimensions,
+    save_validated_upload,
+    sniff_format,
+)
+
+
+def _star_counter():
+    pytest.importorskip("cv2")
+    from app.services.star_counter import StarCounter
+    return StarCounter()
+
+
+def _png_header(width, height):
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    chunk = b"IHDR" + ihdr
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", len(ihdr)) + chunk + struct.pack(">I", zlib.crc32(chunk))
+
+
+def _jpeg(width, height, scan_size=1024, eoi=True, app_segment=b""):
+    """디코딩은 하지 않으므로 SOF 세그먼트와 임의의 스캔 데이터만 담은 JPEG"""
+    sof = b"\xff\xc0" + struct.pack(">HBHHB", 17, 8, height, width, 3) + b"\x01\x22\x00\x02\x11\x01\x03\x11\x01"
+    return b"\xff\xd8" + app_segment + sof + b"\x00" * scan_size + (b"\xff\xd9" if eoi else b"")
+
+
+def _save(data, path, filename="sky.jpg"):
+    return asyncio.run(save_validated_upload(UploadFile(file=io.BytesIO(data), filename=filename), str(path)))
+
+
+def test_png_truncated_after_header_is_reported_as_unreadable(tmp_path):
+    head = _png_header(100, 100)[:30]
+    assert sniff_format(head) == "png"
+    assert probe_dimensions("png", head) == (100, 100)
+
+    path = tmp_path / "truncated.png"
+    path.write_bytes(head)
+    with pytest.raises(UnreadableImageError):
+        _star_counter().count_stars(str(path))
+
+
+def test_missing_file_is_still_file_not_found(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        _star_counter().count_stars(str(tmp_path / "missing.png"))
+
+
+def test_complete_jpeg_is_saved(tmp_path):
+    path = tmp_path / "sky.jpg"
+    data = _jpeg(120, 100)
+
+    assert _save(data, path) == {"format": "jpeg", "width": 120, "height": 100, "size": len(data)}
+    assert path.read_bytes() == data
+
+
+def test_jpeg_without_eoi_is_rejected_and_removed(tmp_path):
+    path = tmp_path / "sky.jpg"
+
+    with pytest.raises(HTTPException) as exc:
+        _save(_jpeg(120, 100, scan_size=3 * CHUNK_SIZE, eoi=False), path)
+
+    assert exc.value.status_code == 400
+    assert not path.exists()
+
+
+def test_jpeg_eoi_split_across_chunks_is_found(tmp_path):
+    header_size = len(_jpeg(120, 100, scan_size=0, eoi=False))
+    data = _jpeg(120, 100, scan_size=CHUNK_SIZE - header_size - 1)
+    assert data[CHUNK_SIZE - 1:] == b"\xff\xd9"
+
+    assert _save(data, tmp_path / "sky.jpg")["size"] == CHUNK_SIZE + 1
+
+
+def test_jpeg_trailing_data_after_eoi_is_allowed(tmp_path):
+    data = _jpeg(120, 100) + b"trailer"
+
+    assert _save(data, tmp_path / "sky.jpg")["size"] == len(data)
+
+
+def test_jpeg_eoi_only_in_exif_thumbnail_is_rejected(tmp_path):
+    thumbnail = b"Exif\x00\x00" + b"\xff\xd8\xff\xd9"
+    app1 = b"\xff\xe1" + struct.pack(">H", len(thumbnail) + 2) + thumbnail
+
+    with pytest.raises(HTTPException):
+        _save(_jpeg(120, 100, eoi=False, app_segment=app1), tmp_path / "sky.jpg")